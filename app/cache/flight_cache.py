@@ -1,12 +1,16 @@
 import json
 import hashlib
-from typing import Dict, Optional, Tuple, List
+from typing import Callable, Dict, Optional, Tuple, List
 from datetime import datetime, timedelta
 import asyncio
 from app.session.redis_store import RedisSessionStore
 from app.amadeus.client import AmadeusClient
 
 
+def _suggestion_price(suggestion: Dict) -> float:
+    return float(suggestion.get("price", 0))
+
+
 class FlightCacheManager:
     def __init__(self, redis_store: RedisSessionStore, amadeus_client: AmadeusClient):
         self.redis_store = redis_store
@@ -85,6 +89,26 @@ class FlightCacheManager:
             origin, destination, dep_date, ret_date, adults
         )
 
+    def get_cached_results(self, cache_key: str, max_age_minutes: float = 60,
+                           stale_after_minutes: Optional[float] = None,
+                           on_stale: Optional[Callable[[], None]] = None) -> Optional[Dict]:
+        # Synchronous cache lookup used by the LangGraph search tool. Entries older
+        # than stale_after_minutes are still served (up to max_age_minutes), and
+        # on_stale is called so the caller can refresh them in the background.
+        cached = self.redis_store.get_cached_search(cache_key)
+        if not cached or not self._is_cache_fresh(cached, max_age_minutes):
+            self.cache_stats["misses"] += 1
+            return None
+
+        self.cache_stats["hits"] += 1
+        if (on_stale is not None and stale_after_minutes is not None
+                and not self._is_cache_fresh(cached, stale_after_minutes)):
+            on_stale()
+        # Unwrap the metadata envelope written by cache_results
+        if isinstance(cached, dict) and "cached_at" in cached and "results" in cached:
+            return cached["results"]
+        return cached
+
     def cache_results(self, cache_key: str, results: Dict, ttl: int = 3600) -> None:
         # Add metadata for cache management
         cache_data = {
@@ -189,4 +213,4 @@ class FlightCacheManager:
                 except:
                     pass
 
-        return sorted(suggestions, key=lambda x: float(x.get("price", 0))) if suggestions else []
+        return sorted(suggestions, key=_suggestion_price) if suggestions else []
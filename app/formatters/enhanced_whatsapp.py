@@ -1,29 +1,91 @@
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
+from functools import lru_cache
+from operator import itemgetter
 import random
+import threading
+
+
+_GREETINGS = (
+    "Hey there! 👋",
+    "Hi! ✈️",
+    "Hello!",
+    "Hey!",
+)
+_CONFIRMATIONS = (
+    "Perfect!",
+    "Great!",
+    "Awesome!",
+    "Got it!",
+    "Excellent!",
+)
+_THINKING_PHRASES = (
+    "Let me check that for you...",
+    "Searching for the best options...",
+    "Looking for great deals...",
+    "Finding your flights...",
+)
+_ERROR_MESSAGES = {
+    "general": "Oops! Something went wrong. Could you try that again?",
+    "no_results": "I couldn't find any flights for those dates. Try different dates?",
+    "api_error": "Having trouble reaching the flight systems. Give me a moment and try again?",
+    "invalid_input": "I didn't quite understand that. Could you rephrase?",
+}
+
+_rng_local = threading.local()
+
+
+def _rng() -> random.Random:
+    # Per-thread generator so worker threads don't share the module-level Random
+    rng = getattr(_rng_local, "rng", None)
+    if rng is None:
+        rng = _rng_local.rng = random.Random()
+    return rng
+
+
+_RESULTS_HEADER = "✨ **Here are your best options:**\n"
+_RESULTS_HEADER_CACHED = "✨ **Found these flights** (from recent searches):\n"
+_RESULT_SECTIONS = (
+    ("fastest", "**⚡ Fastest Option**"),
+    ("cheapest", "**💰 Best Value**"),
+)
+_RESULTS_FOOTER = (
+    "\n**What would you like to do?**",
+    "• Reply 'book cheapest' or 'book fastest'",
+    "• Reply 'more options' to see alternatives",
+    "• Reply 'different dates' to check other days",
+)
+
+# One template per flight: airline and route, duration, stops, price
+_FLIGHT_TEMPLATE = (
+    "**{carrier}** • {route}\n"
+    "✈️ {duration} flight\n"
+    "• {stops}\n"
+    "💵 **${price:.2f}** per person"
+)
+_STOP_LABELS = {0: "Direct flight", 1: "1 stop"}
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO date/datetime; a session re-formats the same dates every turn"""
+    return datetime.fromisoformat(value)
+
+
+@lru_cache(maxsize=512)
+def _natural_duration(duration_mins: int) -> str:
+    """Duration in conversational form, e.g. 150 -> "2h 30m", 120 -> "2 hours"."""
+    hours, mins = divmod(duration_mins, 60)
+    if hours > 0:
+        return f"{hours}h {mins}m" if mins > 0 else f"{hours} hours"
+    return f"{mins} minutes"
 
 
 class NaturalFormatter:
     def __init__(self):
-        self.greetings = [
-            "Hey there! 👋",
-            "Hi! ✈️",
-            "Hello!",
-            "Hey!",
-        ]
-        self.confirmations = [
-            "Perfect!",
-            "Great!",
-            "Awesome!",
-            "Got it!",
-            "Excellent!",
-        ]
-        self.thinking_phrases = [
-            "Let me check that for you...",
-            "Searching for the best options...",
-            "Looking for great deals...",
-            "Finding your flights...",
-        ]
+        self.greetings = _GREETINGS
+        self.confirmations = _CONFIRMATIONS
+        self.thinking_phrases = _THINKING_PHRASES
 
     def format_greeting(self, time_of_day: str = None) -> str:
         if not time_of_day:
@@ -35,48 +97,41 @@ class NaturalFormatter:
             else:
                 time_of_day = "evening"
 
-        greeting = random.choice(self.greetings)
+        greeting = _rng().choice(self.greetings)
         return f"{greeting} Ready to find your perfect flight!"
 
     def format_confirmation_natural(self, info: Dict, suggestions: List[Dict] = None) -> str:
-        parts = []
-
-        # Start with a confirmation phrase
-        parts.append(random.choice(self.confirmations))
-
-        # Build natural sentence
-        journey = []
-        journey.append(f"flights from **{info['origin']}** to **{info['destination']}**")
-
         # Format date naturally
-        dep_date = datetime.fromisoformat(info['departure_date'])
+        dep_date = _parse_iso(info['departure_date'])
         days_until = (dep_date - datetime.now()).days
 
         if days_until == 0:
-            journey.append("for **today**")
+            when = "for **today**"
         elif days_until == 1:
-            journey.append("for **tomorrow**")
+            when = "for **tomorrow**"
         elif days_until < 7:
-            journey.append(f"for **{dep_date.strftime('%A')}** ({dep_date.strftime('%b %d')})")
+            when = f"for **{dep_date.strftime('%A')}** ({dep_date.strftime('%b %d')})"
         else:
-            journey.append(f"on **{dep_date.strftime('%B %d')}**")
+            when = f"on **{dep_date.strftime('%B %d')}**"
+
+        # Build the journey sentence in one pass instead of joining a word list
+        sentence = f"So you need flights from **{info['origin']}** to **{info['destination']}** {when}"
 
         if info.get('return_date'):
-            ret_date = datetime.fromisoformat(info['return_date'])
-            trip_length = (ret_date - dep_date).days
-            journey.append(f"returning after **{trip_length} days**")
+            trip_length = (_parse_iso(info['return_date']) - dep_date).days
+            sentence += f" returning after **{trip_length} days**"
 
         passengers = info.get('passengers', 1)
         if passengers > 1:
-            journey.append(f"for **{passengers} travelers**")
+            sentence += f" for **{passengers} travelers**"
 
-        parts.append(f"So you need {' '.join(journey)}.")
+        # Start with a confirmation phrase
+        parts = [_rng().choice(self.confirmations), sentence + "."]
 
         # Add smart suggestions if available
         if suggestions:
             parts.append("\n💡 **Quick tip:**")
-            for suggestion in suggestions[:2]:
-                parts.append(f"• {suggestion}")
+            parts.extend(f"• {suggestion}" for suggestion in suggestions[:2])
 
         parts.append("\n**Ready to search?** (Reply 'yes' to continue)")
 
@@ -114,25 +169,13 @@ class NaturalFormatter:
         return options.get("first", "Could you tell me more about your trip?")
 
     def format_results_conversational(self, results: Dict, from_cache: bool = False) -> str:
-        lines = []
-
-        if from_cache:
-            lines.append("✨ **Found these flights** (from recent searches):\n")
-        else:
-            lines.append("✨ **Here are your best options:**\n")
+        lines = [_RESULTS_HEADER_CACHED if from_cache else _RESULTS_HEADER]
 
         # Format each flight option conversationally
-        if "fastest" in results and results["fastest"]:
-            flight = results["fastest"]
-            lines.append("**⚡ Fastest Option**")
-            lines.append(self._format_single_flight_natural(flight))
-            lines.append("")
-
-        if "cheapest" in results and results["cheapest"]:
-            flight = results["cheapest"]
-            lines.append("**💰 Best Value**")
-            lines.append(self._format_single_flight_natural(flight))
-            lines.append("")
+        for key, title in _RESULT_SECTIONS:
+            flight = results.get(key)
+            if flight:
+                lines += (title, self._format_single_flight_natural(flight), "")
 
         # Add helpful context
         if results.get("price_difference"):
@@ -140,55 +183,25 @@ class NaturalFormatter:
             lines.append(f"💡 The fastest option is ${diff:.0f} more but saves you {results.get('time_saved', 'time')}")
 
         # Add quick actions
-        lines.append("\n**What would you like to do?**")
-        lines.append("• Reply 'book cheapest' or 'book fastest'")
-        lines.append("• Reply 'more options' to see alternatives")
-        lines.append("• Reply 'different dates' to check other days")
+        lines += _RESULTS_FOOTER
 
         return "\n".join(lines)
 
     def _format_single_flight_natural(self, flight: Dict) -> str:
-        parts = []
-
-        # Airline and route
-        parts.append(f"**{flight.get('carrier', 'Airline')}** • {flight.get('route', 'Route')}")
-
-        # Duration in natural language
-        duration_mins = flight.get('duration_minutes', 0)
-        hours = duration_mins // 60
-        mins = duration_mins % 60
-        if hours > 0:
-            duration_str = f"{hours}h {mins}m" if mins > 0 else f"{hours} hours"
-        else:
-            duration_str = f"{mins} minutes"
-        parts.append(f"✈️ {duration_str} flight")
-
-        # Stops
         stops = flight.get('stops', 0)
-        if stops == 0:
-            parts.append("• Direct flight")
-        elif stops == 1:
-            parts.append("• 1 stop")
-        else:
-            parts.append(f"• {stops} stops")
-
-        # Price
-        price = flight.get('price', 0)
-        parts.append(f"💵 **${price:.2f}** per person")
-
-        return "\n".join(parts)
+        return _FLIGHT_TEMPLATE.format(
+            carrier=flight.get('carrier', 'Airline'),
+            route=flight.get('route', 'Route'),
+            duration=_natural_duration(flight.get('duration_minutes', 0)),
+            stops=_STOP_LABELS[stops] if stops in _STOP_LABELS else f"{stops} stops",
+            price=flight.get('price', 0),
+        )
 
     def format_searching_message(self) -> str:
-        return random.choice(self.thinking_phrases) + " ⏳"
+        return _rng().choice(self.thinking_phrases) + " ⏳"
 
     def format_error_friendly(self, error_type: str = "general") -> str:
-        errors = {
-            "general": "Oops! Something went wrong. Could you try that again?",
-            "no_results": "I couldn't find any flights for those dates. Try different dates?",
-            "api_error": "Having trouble reaching the flight systems. Give me a moment and try again?",
-            "invalid_input": "I didn't quite understand that. Could you rephrase?",
-        }
-        return errors.get(error_type, errors["general"])
+        return _ERROR_MESSAGES.get(error_type, _ERROR_MESSAGES["general"])
 
     def format_correction_response(self, field: str, old_value: str, new_value: str) -> str:
         responses = {
@@ -204,7 +217,7 @@ class NaturalFormatter:
 
         # Date-based suggestions
         if context.get("departure_date"):
-            dep_date = datetime.fromisoformat(context["departure_date"])
+            dep_date = _parse_iso(context["departure_date"])
             if dep_date.weekday() in [4, 5, 6]:  # Friday, Saturday, Sunday
                 suggestions.append("Weekend flights tend to be pricier. Consider Thursday departure for better rates.")
 
@@ -233,7 +246,7 @@ class NaturalFormatter:
 
         if session.get("preferences", {}).get("frequent_routes"):
             top_route = max(session["preferences"]["frequent_routes"].items(),
-                          key=lambda x: x[1])[0]
+                          key=itemgetter(1))[0]
             actions.append(f"'search {top_route}' for your usual route")
 
         if session.get("last_search"):
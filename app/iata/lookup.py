@@ -1,20 +1,43 @@
-from typing import List, Dict, Set
+from typing import List, Dict, FrozenSet, Set, Tuple, Optional
 import os
-import json
+import sys
+import orjson
 import csv
+from functools import lru_cache
+
+
+# Distinct normalised inputs kept by the resolve() cache
+_RESOLVE_CACHE_SIZE = 4096
+
+# Partial matches return at most this many codes
+_PARTIAL_MATCH_LIMIT = 5
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _build_trigram_index(names: List[str]) -> Dict[str, Set[int]]:
+    """Map each character trigram to the positions of the names containing it"""
+    index: Dict[str, Set[int]] = {}
+    for pos, name in enumerate(names):
+        for gram in _trigrams(name):
+            index.setdefault(gram, set()).add(pos)
+    return index
 
 
 class IATADb:
     """Lightweight IATA database loader without pandas.
 
     Prefers a prebuilt JSON index if available, with CSV fallback. Provides
-    O(1) exact lookups for city, country, and IATA code; partial matches fall
-    back to scanning keys when needed.
+    O(1) exact lookups for city, country, and IATA code; partial matches are
+    narrowed with a character-trigram index before substring checks.
     """
 
     def __init__(self, csv_path: str):
-        self.by_city: Dict[str, List[str]] = {}
-        self.by_country: Dict[str, List[str]] = {}
+        # Code lists while loading; frozen to deduplicated tuples below
+        self.by_city: Dict[str, Tuple[str, ...]] = {}
+        self.by_country: Dict[str, Tuple[str, ...]] = {}
         self.codes: Set[str] = set()
         self.aliases: Dict[str, str] = {}
         self.country_aliases: Dict[str, str] = {
@@ -34,23 +57,9 @@ class IATADb:
         else:
             self._load_from_csv(csv_path)
 
-        # Deduplicate lists while preserving order
-        for k, lst in list(self.by_city.items()):
-            seen = set()
-            deduped = []
-            for code in lst:
-                if code not in seen:
-                    seen.add(code)
-                    deduped.append(code)
-            self.by_city[k] = deduped
-        for k, lst in list(self.by_country.items()):
-            seen = set()
-            deduped = []
-            for code in lst:
-                if code not in seen:
-                    seen.add(code)
-                    deduped.append(code)
-            self.by_country[k] = deduped
+        # Deduplicate while preserving order; tuples are compact and safe to hand out
+        self.by_city = {k: tuple(dict.fromkeys(lst)) for k, lst in self.by_city.items()}
+        self.by_country = {k: tuple(dict.fromkeys(lst)) for k, lst in self.by_country.items()}
 
         # Extend with pragmatic English aliases for common user phrasing
         extra_city_aliases = {
@@ -91,9 +100,23 @@ class IATADb:
         }
         self.country_aliases.update({k: v for k, v in extra_country_aliases.items()})
 
+        # Exact-match tables with aliases folded in, so resolve() does one probe per name
+        self._city_lookup = self._fuse_aliases(self.by_city, self.aliases)
+        self._country_lookup = self._fuse_aliases(self.by_country, self.country_aliases)
+        # Membership sets for the city,country intersection in resolve()
+        self._country_sets: Dict[str, FrozenSet[str]] = {
+            key: frozenset(codes) for key, codes in self._country_lookup.items()
+        }
+
+        # (names, trigram index) for partial matching, built on first partial lookup
+        self._city_grams: Optional[Tuple[List[str], Dict[str, Set[int]]]] = None
+        self._country_grams: Optional[Tuple[List[str], Dict[str, Set[int]]]] = None
+        # Bound per instance so the cache does not keep a module-level reference to self
+        self._resolve_cached = lru_cache(maxsize=_RESOLVE_CACHE_SIZE)(self._resolve_uncached)
+
     def _load_from_json(self, path: str) -> None:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
 
         # Aliases (city synonyms) are optional
         self.aliases = {k.strip().lower(): v.strip().lower() for k, v in data.get("aliases", {}).items()}
@@ -105,7 +128,7 @@ class IATADb:
                 continue
             codes = []
             for e in entries or []:
-                code = str(e.get("iata_code", "")).upper()
+                code = sys.intern(str(e.get("iata_code", "")).upper())
                 if len(code) == 3:
                     codes.append(code)
                     self.codes.add(code)
@@ -115,7 +138,7 @@ class IATADb:
         # Build by_country from by_code
         by_code = data.get("by_code", {})
         for code, meta in by_code.items():
-            up = str(code).upper()
+            up = sys.intern(str(code).upper())
             if len(up) != 3:
                 continue
             self.codes.add(up)
@@ -125,13 +148,28 @@ class IATADb:
 
     def _load_from_csv(self, path: str) -> None:
         with open(path, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return
+            # Plain tuples indexed by column position; no per-row dict
+            columns = [h.strip() for h in header]
+            try:
+                code_i = columns.index("iata_code")
+            except ValueError:
+                return
+            city_i = columns.index("city") if "city" in columns else None
+            country_i = columns.index("country") if "country" in columns else None
             for row in reader:
-                country = (row.get("country") or "").strip()
-                city = (row.get("city") or "").strip()
-                code = (row.get("iata_code") or "").strip().upper()
-                if not code or len(code) != 3:
+                width = len(row)
+                if code_i >= width:
+                    continue
+                code = row[code_i].strip().upper()
+                if len(code) != 3:
                     continue
+                code = sys.intern(code)
+                city = row[city_i].strip() if city_i is not None and city_i < width else ""
+                country = row[country_i].strip() if country_i is not None and country_i < width else ""
                 self.codes.add(code)
                 city_lower = city.lower()
                 country_lower = country.lower()
@@ -140,12 +178,50 @@ class IATADb:
                 if country_lower:
                     self.by_country.setdefault(country_lower, []).append(code)
 
-    def _normalise_city(self, text_lower: str) -> str:
-        # apply alias if any
-        return self.aliases.get(text_lower, text_lower)
+    @staticmethod
+    def _fuse_aliases(
+        table: Dict[str, Tuple[str, ...]], aliases: Dict[str, str]
+    ) -> Dict[str, Tuple[str, ...]]:
+        """Equivalent of table.get(aliases.get(key, key)) as a single dict"""
+        fused = {key: codes for key, codes in table.items() if key not in aliases}
+        for alias, canonical in aliases.items():
+            codes = table.get(canonical)
+            if codes:
+                fused[alias] = codes
+        return fused
+
+    def _partial_matches(
+        self,
+        t: str,
+        table: Dict[str, Tuple[str, ...]],
+        grams: Tuple[List[str], Dict[str, Set[int]]],
+    ) -> List[str]:
+        """Codes of names containing t, in table order, capped at the partial limit.
 
-    def _normalise_country(self, text_lower: str) -> str:
-        return self.country_aliases.get(text_lower, text_lower)
+        Only names sharing every trigram of t are substring-checked; posting
+        sets are intersected smallest-first. Queries shorter than a trigram
+        scan all names.
+        """
+        names, index = grams
+        if len(t) >= 3:
+            postings = sorted((index.get(gram, set()) for gram in _trigrams(t)), key=len)
+            positions = sorted(postings[0].intersection(*postings[1:]))
+        else:
+            positions = range(len(names))
+
+        seen: Set[str] = set()
+        found: List[str] = []
+        for pos in positions:
+            name = names[pos]
+            if t not in name:
+                continue
+            for code in table[name]:
+                if code not in seen:
+                    seen.add(code)
+                    found.append(code)
+                    if len(found) == _PARTIAL_MATCH_LIMIT:
+                        return found
+        return found
 
     def resolve(self, text: str) -> List[str]:
         """Resolve a free-text input to a list of IATA airport codes.
@@ -158,52 +234,51 @@ class IATADb:
         raw = text.strip()
         if not raw:
             return []
-        t = raw.lower()
+        # Resolution is case-insensitive, so "London" and "london" share an entry
+        return list(self._resolve_cached(raw.lower()))
 
+    def _resolve_uncached(self, t: str) -> Tuple[str, ...]:
         # Direct IATA code
-        if len(raw) == 3:
-            up = raw.upper()
+        if len(t) == 3:
+            up = t.upper()
             if up in self.codes:
-                return [up]
+                return (up,)
 
         # Try city,country pair if comma present
         if "," in t:
             city_part, country_part = t.split(",", 1)
-            city_key = self._normalise_city(city_part.strip())
-            country_key = self._normalise_country(country_part.strip())
-            city_list = self.by_city.get(city_key, [])
-            country_list = self.by_country.get(country_key, [])
-            if city_list and country_list:
-                inter = [c for c in city_list if c in set(country_list)]
+            city_list = self._city_lookup.get(city_part.strip())
+            country_set = self._country_sets.get(country_part.strip())
+            if city_list and country_set:
+                # City lists are already deduplicated, so filtering keeps them unique
+                inter = tuple(c for c in city_list if c in country_set)
                 if inter:
-                    return list(dict.fromkeys(inter))
+                    return inter
 
-        # Exact city
-        city_key = self._normalise_city(t)
-        if city_key in self.by_city:
-            return list(self.by_city[city_key])
+        # Exact city (alias or name)
+        codes = self._city_lookup.get(t)
+        if codes:
+            return codes
 
-        # Exact country
-        country_key = self._normalise_country(t)
-        if country_key in self.by_country:
-            return list(self.by_country[country_key])
+        # Exact country (alias or name)
+        codes = self._country_lookup.get(t)
+        if codes:
+            return codes
 
         # Partial city match (cap to top 5 unique codes)
-        matches: List[str] = []
-        for city_name, codes in self.by_city.items():
-            if t in city_name or city_name.startswith(t):
-                matches.extend(codes)
+        if self._city_grams is None:
+            names = list(self.by_city)
+            self._city_grams = (names, _build_trigram_index(names))
+        matches = self._partial_matches(t, self.by_city, self._city_grams)
         if matches:
-            uniq = list(dict.fromkeys(matches))
-            return uniq[:5]
+            return tuple(matches)
 
         # Partial country match (cap to top 5 unique codes)
-        matches = []
-        for country_name, codes in self.by_country.items():
-            if t in country_name or country_name.startswith(t):
-                matches.extend(codes)
+        if self._country_grams is None:
+            names = list(self.by_country)
+            self._country_grams = (names, _build_trigram_index(names))
+        matches = self._partial_matches(t, self.by_country, self._country_grams)
         if matches:
-            uniq = list(dict.fromkeys(matches))
-            return uniq[:5]
+            return tuple(matches)
 
-        return []
+        return ()
@@ -1,8 +1,11 @@
 import asyncio
+import heapq
+import math
+import random
+import threading
 import time
-from typing import Dict, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
 from enum import Enum
 import redis
 
@@ -26,55 +29,94 @@ class CircuitBreaker:
         self.recovery_timeout = recovery_timeout
         self.expected_exception = expected_exception
         self.failure_count = 0
-        self.last_failure_time = None
+        self.last_failure_time = None  # wall clock, for reporting
         self.state = CircuitState.CLOSED
+        # Transitions are guarded so concurrent callers cannot both probe a half-open breaker.
+        # Nothing awaits while holding it, so one threading lock serves sync and async calls.
+        self._lock = threading.Lock()
+        self._last_failure_monotonic: Optional[float] = None
+        self._probe_in_flight = False
 
     def call(self, func: Callable, *args, **kwargs) -> Any:
-        if self.state == CircuitState.OPEN:
-            if self._should_attempt_reset():
-                self.state = CircuitState.HALF_OPEN
-            else:
-                raise Exception(f"Circuit breaker {self.name} is OPEN")
-
+        self._before_call()
         try:
             result = func(*args, **kwargs)
-            self._on_success()
-            return result
-        except self.expected_exception as e:
+        except self.expected_exception:
             self._on_failure()
-            raise e
+            raise
+        except BaseException:
+            self._release_probe()
+            raise
+        self._on_success()
+        return result
 
     async def async_call(self, func: Callable, *args, **kwargs) -> Any:
-        if self.state == CircuitState.OPEN:
-            if self._should_attempt_reset():
-                self.state = CircuitState.HALF_OPEN
-            else:
-                raise Exception(f"Circuit breaker {self.name} is OPEN")
-
+        self._before_call()
         try:
             result = await func(*args, **kwargs)
-            self._on_success()
-            return result
-        except self.expected_exception as e:
+        except self.expected_exception:
             self._on_failure()
-            raise e
+            raise
+        except BaseException:
+            self._release_probe()
+            raise
+        self._on_success()
+        return result
+
+    def _before_call(self):
+        # Lock-free fast path for the common healthy case
+        if self.state is CircuitState.CLOSED:
+            return
+
+        with self._lock:
+            if self.state is CircuitState.OPEN:
+                if not self._should_attempt_reset():
+                    raise Exception(f"Circuit breaker {self.name} is OPEN")
+                self.state = CircuitState.HALF_OPEN
+            elif self.state is CircuitState.CLOSED:
+                return
+
+            # HALF_OPEN: a single probe request decides whether to close again
+            if self._probe_in_flight:
+                raise Exception(f"Circuit breaker {self.name} is HALF_OPEN")
+            self._probe_in_flight = True
 
     def _on_success(self):
-        self.failure_count = 0
-        self.state = CircuitState.CLOSED
+        if self.state is CircuitState.CLOSED and self.failure_count == 0:
+            return
+        with self._lock:
+            self.failure_count = 0
+            self.state = CircuitState.CLOSED
+            self._probe_in_flight = False
 
     def _on_failure(self):
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-        if self.failure_count >= self.failure_threshold:
-            self.state = CircuitState.OPEN
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_time = time.time()
+            self._last_failure_monotonic = time.monotonic()
+            if self.state is CircuitState.HALF_OPEN or self.failure_count >= self.failure_threshold:
+                self.state = CircuitState.OPEN
+            self._probe_in_flight = False
+
+    def _release_probe(self):
+        # An unexpected exception says nothing about the service; let the next call probe
+        if self._probe_in_flight:
+            with self._lock:
+                self._probe_in_flight = False
 
     def _should_attempt_reset(self) -> bool:
         return (
-            self.last_failure_time and
-            time.time() - self.last_failure_time >= self.recovery_timeout
+            self._last_failure_monotonic is not None and
+            time.monotonic() - self._last_failure_monotonic >= self.recovery_timeout
         )
 
+    def reset(self):
+        """Force the breaker closed (admin use)"""
+        with self._lock:
+            self.failure_count = 0
+            self.state = CircuitState.CLOSED
+            self._probe_in_flight = False
+
     def get_state(self) -> Dict:
         return {
             "name": self.name,
@@ -84,10 +126,39 @@ class CircuitBreaker:
         }
 
 
+# Sliding-window log in a sorted set. Only admitted requests are recorded,
+# so rejected calls do not extend a client's lockout.
+# KEYS[1]: rate limit key; ARGV: now, window seconds, max requests, unique member
+_SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('EXPIRE', KEYS[1], window + 1)
+    return {1, count + 1}
+end
+return {0, count}
+"""
+
+
+# Seconds between sweeps of idle keys from the in-memory limiter
+_LOCAL_SWEEP_INTERVAL = 60
+# A key idle for this many windows has long since refilled and can be dropped
+_LOCAL_IDLE_WINDOWS = 10
+
+
 class RateLimiter:
     def __init__(self, redis_client: redis.Redis = None):
         self.redis_client = redis_client
-        self.local_cache = defaultdict(lambda: deque(maxlen=100))
+        # key -> (tokens left, last refill time) for the in-memory token bucket
+        self.local_cache: Dict[str, Tuple[float, float]] = {}
+        self._last_sweep = time.monotonic()
+        # redis-py runs registered scripts with EVALSHA and reloads them on NOSCRIPT
+        self._rate_limit_script = (
+            redis_client.register_script(_SLIDING_WINDOW_LUA) if redis_client else None
+        )
 
     def check_rate_limit(
         self,
@@ -107,21 +178,14 @@ class RateLimiter:
     ) -> tuple[bool, Dict]:
         redis_key = f"rate_limit:{key}"
         now = time.time()
-        pipeline = self.redis_client.pipeline()
 
-        # Remove old entries
-        pipeline.zremrangebyscore(redis_key, 0, now - window_seconds)
-        # Add current request
-        pipeline.zadd(redis_key, {str(now): now})
-        # Count requests in window
-        pipeline.zcard(redis_key)
-        # Set expiry
-        pipeline.expire(redis_key, window_seconds + 1)
-
-        results = pipeline.execute()
-        request_count = results[2]
+        # Prune, count and record in one atomic server-side call
+        allowed, request_count = self._rate_limit_script(
+            keys=[redis_key],
+            args=[now, window_seconds, max_requests, time.time_ns()]
+        )
 
-        allowed = request_count <= max_requests
+        allowed = bool(allowed)
         return allowed, {
             "allowed": allowed,
             "current": request_count,
@@ -136,31 +200,36 @@ class RateLimiter:
         max_requests: int,
         window_seconds: int
     ) -> tuple[bool, Dict]:
-        now = time.time()
-        request_times = self.local_cache[key]
-
-        # Remove old requests outside window
-        cutoff = now - window_seconds
-        while request_times and request_times[0] < cutoff:
-            request_times.popleft()
-
-        # Check if under limit
-        if len(request_times) < max_requests:
-            request_times.append(now)
-            return True, {
-                "allowed": True,
-                "current": len(request_times),
-                "limit": max_requests,
-                "window_seconds": window_seconds
-            }
+        # Token bucket: holds up to max_requests tokens, refilled evenly over the window
+        now = time.monotonic()
+        if now - self._last_sweep > _LOCAL_SWEEP_INTERVAL:
+            self._sweep_idle_keys(now, window_seconds)
 
-        return False, {
-            "allowed": False,
-            "current": len(request_times),
+        refill_rate = max_requests / window_seconds
+        tokens, last_refill = self.local_cache.get(key, (float(max_requests), now))
+        tokens = min(float(max_requests), tokens + (now - last_refill) * refill_rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self.local_cache[key] = (tokens, now)
+
+        info = {
+            "allowed": allowed,
+            "current": int(max_requests - tokens),
             "limit": max_requests,
-            "window_seconds": window_seconds,
-            "retry_after": window_seconds
+            "window_seconds": window_seconds
         }
+        if not allowed:
+            info["retry_after"] = math.ceil((1 - tokens) / refill_rate)
+        return allowed, info
+
+    def _sweep_idle_keys(self, now: float, window_seconds: int) -> None:
+        cutoff = now - _LOCAL_IDLE_WINDOWS * window_seconds
+        idle = [k for k, (_, last_refill) in self.local_cache.items() if last_refill < cutoff]
+        for k in idle:
+            del self.local_cache[k]
+        self._last_sweep = now
 
 
 class HealthChecker:
@@ -168,45 +237,55 @@ class HealthChecker:
         self.checks = {}
         self.last_check_time = {}
         self.check_results = {}
+        # Min-heap of (next due time, name); entries not matching _due are stale
+        self._schedule: List[Tuple[float, str]] = []
+        self._due: Dict[str, float] = {}
+        # Aggregate status, recomputed only when a check's status changes
+        self._overall_status = "healthy"
 
     def register_check(self, name: str, check_func: Callable, interval_seconds: int = 30):
         self.checks[name] = {
             "func": check_func,
             "interval": interval_seconds
         }
+        self.check_results.setdefault(name, {"status": "unknown"})
+        # Run on the next call to run_checks
+        self._due[name] = 0.0
+        heapq.heappush(self._schedule, (0.0, name))
 
     async def run_checks(self) -> Dict:
-        results = {}
-        tasks = []
-
-        for name, check_info in self.checks.items():
-            # Check if we should run this check
-            last_time = self.last_check_time.get(name, 0)
-            if time.time() - last_time >= check_info["interval"]:
-                tasks.append(self._run_single_check(name, check_info["func"]))
-
-        if tasks:
+        now = time.monotonic()
+        due_names = []
+        while self._schedule and self._schedule[0][0] <= now:
+            due_time, name = heapq.heappop(self._schedule)
+            if self._due.get(name) == due_time:
+                due_names.append(name)
+
+        if due_names:
+            tasks = [self._run_single_check(name, self.checks[name]["func"]) for name in due_names]
             check_results = await asyncio.gather(*tasks, return_exceptions=True)
+            finished = time.monotonic()
+            status_changed = False
             for name, result in check_results:
-                results[name] = result
+                previous = self.check_results.get(name, {}).get("status")
+                status_changed = status_changed or previous != result.get("status")
                 self.check_results[name] = result
                 self.last_check_time[name] = time.time()
-
-        # Include cached results for checks not run this time
-        for name in self.checks:
-            if name not in results:
-                results[name] = self.check_results.get(name, {"status": "unknown"})
-
-        # Overall status
-        all_healthy = all(
-            r.get("status") == "healthy"
-            for r in results.values()
-            if r.get("status") != "unknown"
-        )
+                next_due = finished + self.checks[name]["interval"]
+                self._due[name] = next_due
+                heapq.heappush(self._schedule, (next_due, name))
+
+            if status_changed:
+                all_healthy = all(
+                    r.get("status") == "healthy"
+                    for r in self.check_results.values()
+                    if r.get("status") != "unknown"
+                )
+                self._overall_status = "healthy" if all_healthy else "unhealthy"
 
         return {
-            "status": "healthy" if all_healthy else "unhealthy",
-            "checks": results,
+            "status": self._overall_status,
+            "checks": dict(self.check_results),
             "timestamp": datetime.now().isoformat()
         }
 
@@ -237,28 +316,38 @@ class RetryPolicy:
         self,
         max_attempts: int = 3,
         backoff_base: float = 2.0,
-        max_delay: int = 60
+        max_delay: int = 60,
+        max_total_seconds: Optional[float] = None
     ):
         self.max_attempts = max_attempts
         self.backoff_base = backoff_base
         self.max_delay = max_delay
+        # Overall time budget; a retry whose backoff would overrun it is not attempted
+        self.max_total_seconds = max_total_seconds
 
     async def execute_with_retry(self, func: Callable, *args, **kwargs) -> Any:
         last_exception = None
+        is_coroutine = asyncio.iscoroutinefunction(func)
+        deadline = (
+            time.monotonic() + self.max_total_seconds
+            if self.max_total_seconds is not None else None
+        )
 
         for attempt in range(self.max_attempts):
             try:
-                if asyncio.iscoroutinefunction(func):
+                if is_coroutine:
                     return await func(*args, **kwargs)
-                else:
-                    return func(*args, **kwargs)
+                return func(*args, **kwargs)
             except Exception as e:
                 last_exception = e
                 if attempt < self.max_attempts - 1:
+                    # Jitter spreads out clients that failed together (e.g. after a breaker trips)
                     delay = min(
-                        self.backoff_base ** attempt,
+                        self.backoff_base ** attempt * (0.5 + random.random()),
                         self.max_delay
                     )
+                    if deadline is not None and time.monotonic() + delay > deadline:
+                        raise
                     await asyncio.sleep(delay)
                     continue
                 raise
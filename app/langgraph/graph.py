@@ -5,28 +5,33 @@ Defines the core StateGraph with nodes and edges for systematic
 travel information collection and validation.
 """
 
-from typing import Dict, Any, Literal
+import logging
+from typing import Dict, Any, Literal, Tuple
+from collections import OrderedDict
+from threading import Lock
 from langgraph.graph import StateGraph, END
-from app.langgraph.state import TravelState, create_initial_state
+from app.langgraph.state import (
+    TravelState,
+    create_initial_state,
+    has_required_fields,
+    increment_clarification_attempts,
+    set_search_results
+)
 
 
 # Import real node implementations
 from app.langgraph.nodes.collect_info import CollectInfoNode
-from app.langgraph.nodes.validate_complete import ValidateCompleteNode
+from app.langgraph.nodes.validate_complete import validate_complete_node
 from app.langgraph.nodes.search_flights import SearchFlightsNode
-from app.langgraph.nodes.present_options import PresentOptionsNode
+from app.langgraph.nodes.present_options import present_options_node
 
 
-def collect_info_node(state: TravelState, llm=None) -> TravelState:
-    """COLLECT_INFO node - extract and accumulate travel entities"""
-    node = CollectInfoNode(llm)
-    return node(state)
+logger = logging.getLogger(__name__)
 
-
-def validate_complete_node(state: TravelState) -> TravelState:
-    """VALIDATE_COMPLETE node - comprehensive validation gate"""
-    node = ValidateCompleteNode()
-    return node(state)
+# Compiled graphs keyed by id() of (llm, amadeus_client, cache_manager); see compile_travel_graph
+_COMPILED_GRAPH_CACHE_SIZE = 8
+_COMPILED_GRAPHS: "OrderedDict[Tuple[int, int, int], Tuple[tuple, Any]]" = OrderedDict()
+_COMPILED_GRAPHS_LOCK = Lock()
 
 
 def search_flights_node(state: TravelState, amadeus_client=None, cache_manager=None) -> TravelState:
@@ -36,32 +41,22 @@ def search_flights_node(state: TravelState, amadeus_client=None, cache_manager=N
         return node(state)
     else:
         # Fallback for testing - set empty search results to route to clarification
-        from app.langgraph.state import set_search_results
         return set_search_results(state, {}, False)
 
 
-def present_options_node(state: TravelState) -> TravelState:
-    """PRESENT_OPTIONS node - format and return flight results (Phase 1 endpoint)"""
-    node = PresentOptionsNode()
-    return node(state)
-
-
 def needs_clarification_node(state: TravelState) -> TravelState:
     """NEEDS_CLARIFICATION node - handle corrections, missing info, ambiguity"""
     # Placeholder implementation - increment attempts to eventually hit termination
-    from app.langgraph.state import increment_clarification_attempts
     return increment_clarification_attempts(state)
 
 
 # Routing functions
 def should_validate(state: TravelState) -> Literal["validate_complete", "needs_clarification"]:
     """Route from collect_info based on extracted information"""
-    from app.langgraph.state import has_required_fields
-
     # FIXED: Only validate when we actually have all required fields
     # This prevents premature validation with partial/corrupted data
     if has_required_fields(state):
-        print(f"[DEBUG] All required fields present - routing to validation")
+        logger.debug("All required fields present - routing to validation")
         return "validate_complete"
 
     # REMOVED: Premature validation logic that caused false errors
@@ -69,7 +64,7 @@ def should_validate(state: TravelState) -> Literal["validate_complete", "needs_c
     #     return "validate_complete"
 
     # Continue collecting information when fields are missing
-    print(f"[DEBUG] Missing required fields - staying in collect_info")
+    logger.debug("Missing required fields - staying in collect_info")
     return "needs_clarification"
 
 
@@ -78,14 +73,14 @@ def should_search(state: TravelState) -> Literal["search_flights", "needs_clarif
     # CRITICAL: Only proceed to search if validation explicitly passed
     ready_for_api = state.get("ready_for_api", False)
 
-    print(f"[DEBUG] Routing decision: ready_for_api={ready_for_api}")
+    logger.debug("Routing decision: ready_for_api=%s", ready_for_api)
 
     if ready_for_api:
-        print("[DEBUG] VALIDATION GATE PASSED - Routing to search_flights")
+        logger.debug("VALIDATION GATE PASSED - Routing to search_flights")
         return "search_flights"
 
     # Return to clarification if validation failed
-    print("[DEBUG] VALIDATION GATE BLOCKED - Routing to needs_clarification")
+    logger.debug("VALIDATION GATE BLOCKED - Routing to needs_clarification")
     return "needs_clarification"
 
 
@@ -115,12 +110,17 @@ def create_travel_graph(llm=None, amadeus_client=None, cache_manager=None) -> St
     # Initialize the StateGraph with TravelState schema
     workflow = StateGraph(TravelState)
 
-    # Create node functions with dependencies
+    # Create node functions with dependencies, building each node once per graph
+    collect_info = CollectInfoNode(llm)
+    search_flights = SearchFlightsNode(amadeus_client, cache_manager) if amadeus_client else None
+
     def collect_info_with_llm(state: TravelState) -> TravelState:
-        return collect_info_node(state, llm)
+        return collect_info(state)
 
     def search_flights_with_client(state: TravelState) -> TravelState:
-        return search_flights_node(state, amadeus_client, cache_manager)
+        if search_flights is None:
+            return search_flights_node(state)
+        return search_flights(state)
 
     # Add nodes
     workflow.add_node("collect_info", collect_info_with_llm)
@@ -177,9 +177,29 @@ def create_travel_graph(llm=None, amadeus_client=None, cache_manager=None) -> St
 
 
 def compile_travel_graph(llm=None, amadeus_client=None, cache_manager=None) -> Any:
-    """Compile the travel state graph for execution"""
-    workflow = create_travel_graph(llm, amadeus_client, cache_manager)
-    return workflow.compile()
+    """Compile the travel state graph for execution.
+
+    Compiled graphs hold no per-conversation state, so one is shared per set of
+    dependencies. Entries keep their dependencies alive and are matched by
+    identity, so a recycled id() can never return a graph bound to other objects.
+    """
+    deps = (llm, amadeus_client, cache_manager)
+    key = tuple(id(dep) for dep in deps)
+
+    with _COMPILED_GRAPHS_LOCK:
+        cached = _COMPILED_GRAPHS.get(key)
+        if cached is not None and all(a is b for a, b in zip(cached[0], deps)):
+            _COMPILED_GRAPHS.move_to_end(key)
+            return cached[1]
+
+    compiled = create_travel_graph(llm, amadeus_client, cache_manager).compile()
+
+    with _COMPILED_GRAPHS_LOCK:
+        _COMPILED_GRAPHS[key] = (deps, compiled)
+        _COMPILED_GRAPHS.move_to_end(key)
+        while len(_COMPILED_GRAPHS) > _COMPILED_GRAPH_CACHE_SIZE:
+            _COMPILED_GRAPHS.popitem(last=False)
+    return compiled
 
 
 # Helper function to start a new conversation
@@ -5,8 +5,9 @@ Main handler that integrates the LangGraph travel assistant with the existing
 WhatsApp infrastructure, preserving Redis sessions, middleware, and caching.
 """
 
-from typing import Dict, Any, Optional
-from langchain_openai import ChatOpenAI
+from typing import Dict, Any, Optional, Tuple, TYPE_CHECKING
+import asyncio
+import logging
 
 from app.session.redis_store import RedisSessionStore
 from app.amadeus.client import AmadeusClient
@@ -15,6 +16,14 @@ from app.user.preferences import UserPreferenceManager
 from app.langgraph.graph import compile_travel_graph, start_conversation
 from app.langgraph.state import TravelState
 
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on graph runs in flight at once across webhook requests
+DEFAULT_MAX_CONCURRENT_MESSAGES = 32
+
 
 class LangGraphHandler:
     """LangGraph integration handler for WhatsApp travel assistant"""
@@ -22,11 +31,12 @@ class LangGraphHandler:
     def __init__(
         self,
         session_store: RedisSessionStore,
-        llm: ChatOpenAI,
+        llm: "ChatOpenAI",
         amadeus_client: AmadeusClient,
         cache_manager: FlightCacheManager,
         user_preferences: UserPreferenceManager = None,
-        iata_db = None
+        iata_db = None,
+        max_concurrent_messages: int = DEFAULT_MAX_CONCURRENT_MESSAGES
     ):
         self.session_store = session_store
         self.llm = llm
@@ -34,6 +44,7 @@ class LangGraphHandler:
         self.cache_manager = cache_manager
         self.user_preferences = user_preferences
         self.iata_db = iata_db
+        self._message_slots = asyncio.Semaphore(max_concurrent_messages)
 
         # Compile the travel graph with dependencies
         self.travel_graph = compile_travel_graph(
@@ -42,38 +53,68 @@ class LangGraphHandler:
             cache_manager=self.cache_manager
         )
 
-        print("[INFO] LangGraph handler initialized with complete travel pipeline")
+        logger.info("LangGraph handler initialized with complete travel pipeline")
 
     def handle_message(self, user_id: str, message: str) -> str:
         """Handle incoming WhatsApp message using LangGraph pipeline"""
-        print(f"[DEBUG] LangGraph handler processing message from {user_id}: '{message}'")
+        logger.debug("LangGraph handler processing message from %s: %r", user_id, message)
 
         try:
-            # Get or create session for state persistence
-            session_data = self.session_store.get(user_id) or {}
-
-            # Check if we have an ongoing conversation state
-            travel_state = self._get_or_create_travel_state(session_data, message)
+            session_data, travel_state = self._prepare_state(user_id, message)
 
             # Execute LangGraph pipeline
             final_state = self.travel_graph.invoke(travel_state)
 
-            # Save updated state to session
-            self._save_travel_state(user_id, session_data, final_state)
+            return self._finalize_result(user_id, session_data, final_state)
 
-            # Return the bot response
-            response = final_state.get("bot_response", "I'm having trouble processing that. Could you try again?")
+        except Exception as e:
+            return self._handle_error(e)
 
-            print(f"[DEBUG] LangGraph response: {response}")
-            return response
+    async def ahandle_message(self, user_id: str, message: str) -> str:
+        """Async entry point: run the pipeline without blocking the event loop.
 
-        except Exception as e:
-            print(f"[ERROR] LangGraph handler error: {type(e).__name__}: {str(e)}")
-            import traceback
-            print(f"[ERROR] Full traceback: {traceback.format_exc()}")
+        The graph runs via ``ainvoke``, which schedules the blocking LLM and
+        Amadeus nodes on LangGraph's executor; session reads and writes go to a
+        worker thread. The semaphore bounds concurrent runs.
+        """
+        async with self._message_slots:
+            logger.debug("LangGraph handler processing message from %s: %r", user_id, message)
+
+            try:
+                session_data, travel_state = await asyncio.to_thread(self._prepare_state, user_id, message)
+
+                final_state = await self.travel_graph.ainvoke(travel_state)
+
+                return await asyncio.to_thread(self._finalize_result, user_id, session_data, final_state)
+
+            except Exception as e:
+                return self._handle_error(e)
+
+    def _prepare_state(self, user_id: str, message: str) -> Tuple[Dict[str, Any], TravelState]:
+        """Load the user's session and build the graph input for this message"""
+        # Get or create session for state persistence
+        session_data = self.session_store.get(user_id) or {}
+
+        # Check if we have an ongoing conversation state
+        return session_data, self._get_or_create_travel_state(session_data, message)
+
+    def _finalize_result(self, user_id: str, session_data: Dict[str, Any], final_state: TravelState) -> str:
+        """Persist the graph output and return the reply to send"""
+        # Save updated state to session
+        self._save_travel_state(user_id, session_data, final_state)
+
+        # Return the bot response
+        response = final_state.get("bot_response", "I'm having trouble processing that. Could you try again?")
+
+        logger.debug("LangGraph response: %s", response)
+        return response
+
+    def _handle_error(self, error: Exception) -> str:
+        """Log a pipeline failure and return the fallback reply"""
+        logger.exception("LangGraph handler error: %s: %s", type(error).__name__, error)
 
-            # Graceful fallback
-            return "I'm experiencing some technical difficulties. Please try your request again in a moment."
+        # Graceful fallback
+        return "I'm experiencing some technical difficulties. Please try your request again in a moment."
 
     def _get_or_create_travel_state(self, session_data: Dict[str, Any], message: str) -> TravelState:
         """Get existing travel state or create new one from session"""
@@ -82,13 +123,13 @@ class LangGraphHandler:
 
         if stored_state:
             # Continue existing conversation
-            print(f"[DEBUG] Continuing existing LangGraph conversation")
+            logger.debug("Continuing existing LangGraph conversation")
             # Update the current message
             stored_state["user_message"] = message
             return stored_state
         else:
             # Start new conversation
-            print(f"[DEBUG] Starting new LangGraph conversation")
+            logger.debug("Starting new LangGraph conversation")
             return start_conversation(message)
 
     def _save_travel_state(self, user_id: str, session_data: Dict[str, Any], travel_state: TravelState):
@@ -116,10 +157,10 @@ class LangGraphHandler:
             # Save to Redis
             self.session_store.set(user_id, session_data)
 
-            print(f"[DEBUG] Saved LangGraph state for user {user_id}")
+            logger.debug("Saved LangGraph state for user %s", user_id)
 
         except Exception as e:
-            print(f"[ERROR] Failed to save travel state: {e}")
+            logger.error("Failed to save travel state: %s", e)
 
     def get_user_session_info(self, user_id: str) -> Dict[str, Any]:
         """Get user session information for debugging/admin purposes"""
@@ -160,11 +201,11 @@ class LangGraphHandler:
 
             self.session_store.set(user_id, session_data)
 
-            print(f"[DEBUG] Reset conversation for user {user_id}")
+            logger.debug("Reset conversation for user %s", user_id)
             return True
 
         except Exception as e:
-            print(f"[ERROR] Failed to reset conversation: {e}")
+            logger.error("Failed to reset conversation: %s", e)
             return False
 
     def get_conversation_metrics(self) -> Dict[str, Any]:
@@ -179,7 +220,7 @@ class LangGraphHandler:
 
 def create_langgraph_handler(
     session_store: RedisSessionStore,
-    llm: ChatOpenAI,
+    llm: "ChatOpenAI",
     amadeus_client: AmadeusClient,
     cache_manager: FlightCacheManager,
     user_preferences: UserPreferenceManager = None,
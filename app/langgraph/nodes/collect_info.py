@@ -5,13 +5,15 @@ Orchestrates information extraction and conversation management to systematicall
 gather travel requirements through natural dialogue.
 """
 
-from typing import Dict, Any, Optional
-from langchain_openai import ChatOpenAI
+import logging
+from typing import Dict, Any, Optional, TYPE_CHECKING
 
 from app.langgraph.state import (
     TravelState,
     add_extracted_info,
-    add_field_confidence,
+    add_field_confidences,
+    get_missing_fields,
+    has_required_fields,
     set_trip_type,
     update_conversation,
     increment_clarification_attempts,
@@ -20,29 +22,35 @@ from app.langgraph.state import (
 from app.langgraph.tools.extractor import create_extraction_tool, ExtractionResult
 from app.langgraph.tools.conversation_manager import create_conversation_manager, ConversationAction
 
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+
+logger = logging.getLogger(__name__)
+
 
 class CollectInfoNode:
     """COLLECT_INFO node implementation"""
 
-    def __init__(self, llm: Optional[ChatOpenAI] = None):
+    def __init__(self, llm: Optional["ChatOpenAI"] = None):
         self.llm = llm
         self.extractor = create_extraction_tool(llm)
         self.conversation_manager = create_conversation_manager()
 
     def __call__(self, state: TravelState) -> TravelState:
         """Process user message and collect travel information"""
-        print(f"[DEBUG] COLLECT_INFO node processing: '{state['user_message']}'")
+        logger.debug("COLLECT_INFO node processing: %r", state["user_message"])
 
         # Extract information from user message
         extraction_result = self._extract_information(state)
-        print(f"[DEBUG] Extraction result: {extraction_result.extraction_method} - {extraction_result.extracted_fields}")
+        logger.debug("Extraction result: %s - %s", extraction_result.extraction_method, extraction_result.extracted_fields)
 
         # Update state with extracted information
         updated_state = self._update_state_with_extraction(state, extraction_result)
 
         # Generate conversational response
         conversation_action = self._generate_response(updated_state, extraction_result)
-        print(f"[DEBUG] Generated response: {conversation_action.question_type} - {conversation_action.question}")
+        logger.debug("Generated response: %s - %s", conversation_action.question_type, conversation_action.question)
 
         # Update conversation history
         final_state = update_conversation(
@@ -55,7 +63,10 @@ class CollectInfoNode:
         missing_fields = self._identify_missing_fields(final_state)
         final_state = set_missing_fields(final_state, missing_fields)
 
-        print(f"[DEBUG] Final state: origin={final_state.get('origin')}, dest={final_state.get('destination')}, date={final_state.get('departure_date')}")
+        logger.debug(
+            "Final state: origin=%s, dest=%s, date=%s",
+            final_state.get("origin"), final_state.get("destination"), final_state.get("departure_date")
+        )
         return final_state
 
     def _extract_information(self, state: TravelState) -> ExtractionResult:
@@ -63,7 +74,7 @@ class CollectInfoNode:
         try:
             return self.extractor._run(state["user_message"], state)
         except Exception as e:
-            print(f"[ERROR] Extraction failed: {e}")
+            logger.error("Extraction failed: %s", e)
             # Return empty result on error
             return ExtractionResult(
                 extracted_fields={},
@@ -82,8 +93,8 @@ class CollectInfoNode:
             updated_state = add_extracted_info(updated_state, result.extracted_fields)
 
             # Add confidence scores
-            for field, confidence in result.field_confidence.items():
-                updated_state = add_field_confidence(updated_state, field, confidence)
+            if result.field_confidence:
+                updated_state = add_field_confidences(updated_state, result.field_confidence)
 
             # Handle trip type updates
             if "trip_type" in result.extracted_fields:
@@ -114,7 +125,7 @@ class CollectInfoNode:
 
             return self.conversation_manager._run(state, extraction_dict)
         except Exception as e:
-            print(f"[ERROR] Conversation generation failed: {e}")
+            logger.error("Conversation generation failed: %s", e)
             # Fallback response
             return ConversationAction(
                 question="I'm sorry, could you tell me more about your travel plans?",
@@ -125,32 +136,26 @@ class CollectInfoNode:
 
     def _identify_missing_fields(self, state: TravelState) -> list[str]:
         """Identify what critical information is still missing"""
-        missing = []
-
-        if not state.get("origin"):
-            missing.append("origin")
-        if not state.get("destination"):
-            missing.append("destination")
-        if not state.get("departure_date"):
-            missing.append("departure_date")
-
-        return missing
+        return get_missing_fields(state)
 
     def _should_proceed_to_validation(self, state: TravelState) -> bool:
         """Check if we have enough information to proceed to validation"""
-        from app.langgraph.state import has_required_fields
         return has_required_fields(state)
 
 
+# Used by collect_info_node whenever no LLM is passed in
+_DEFAULT_COLLECT_INFO_NODE = CollectInfoNode()
+
+
 # Node function for LangGraph integration
-def create_collect_info_node(llm: Optional[ChatOpenAI] = None):
+def create_collect_info_node(llm: Optional["ChatOpenAI"] = None):
     """Create COLLECT_INFO node instance"""
     node = CollectInfoNode(llm)
     return node
 
 
 # Direct callable for graph registration
-def collect_info_node(state: TravelState, llm: Optional[ChatOpenAI] = None) -> TravelState:
+def collect_info_node(state: TravelState, llm: Optional["ChatOpenAI"] = None) -> TravelState:
     """COLLECT_INFO node function for LangGraph StateGraph"""
-    node = CollectInfoNode(llm)
+    node = _DEFAULT_COLLECT_INFO_NODE if llm is None else CollectInfoNode(llm)
     return node(state)
\ No newline at end of file
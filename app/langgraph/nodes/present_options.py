@@ -5,6 +5,10 @@ Formats flight search results naturally using the existing enhanced WhatsApp for
 while preserving conversational state for future phases.
 """
 
+import logging
+import re
+from datetime import datetime
+from operator import itemgetter
 from typing import Dict, Any, Optional
 
 from app.langgraph.state import (
@@ -13,6 +17,22 @@ from app.langgraph.state import (
 )
 from app.formatters.enhanced_whatsapp import NaturalFormatter
 
+logger = logging.getLogger(__name__)
+
+# ISO-8601 itinerary duration (PT10H30M); seconds are accepted and ignored
+_DURATION_RE = re.compile(r"PT(?:(\d+)H)?(?:(\d+)M)?(?:\d+(?:\.\d+)?S)?")
+# Sort value for flights whose duration is missing or unparseable
+_UNKNOWN_DURATION = 999999
+
+# Keys into the (duration, price, flight) tuples built by _transform_amadeus_results
+_BY_DURATION = itemgetter(0)
+_BY_PRICE = itemgetter(1)
+
+
+def _flight_price(flight: Dict[str, Any]) -> float:
+    """Sort key: total offer price (missing prices sort last)"""
+    return float(flight.get("price", {}).get("total", "999999"))
+
 
 class PresentOptionsNode:
     """PRESENT_OPTIONS node implementation - Phase 1 endpoint"""
@@ -22,11 +42,11 @@ class PresentOptionsNode:
 
     def __call__(self, state: TravelState) -> TravelState:
         """Format and present flight search results"""
-        print(f"[DEBUG] PRESENT_OPTIONS node executing...")
+        logger.debug("PRESENT_OPTIONS node executing...")
 
         # Verify we have search results to present
         if not state.get("search_results"):
-            print(f"[ERROR] PRESENT_OPTIONS called without search results")
+            logger.error("PRESENT_OPTIONS called without search results")
             error_response = "Internal error - no results to display. Please try searching again."
             return update_conversation(
                 state,
@@ -44,7 +64,7 @@ class PresentOptionsNode:
             formatted_response
         )
 
-        print(f"[DEBUG] Results presented - Phase 1 complete")
+        logger.debug("Results presented - Phase 1 complete")
         return final_state
 
     def _format_search_results(self, state: TravelState) -> str:
@@ -80,27 +100,28 @@ class PresentOptionsNode:
         if not flights:
             return {}
 
-        # Sort flights by price and duration for categorization
-        sorted_by_price = sorted(flights, key=lambda f: float(f.get("price", {}).get("total", "999999")))
-        sorted_by_duration = sorted(flights, key=lambda f: self._get_total_duration(f))
+        # A single offer is the cheapest by definition and never shown as fastest
+        if len(flights) == 1:
+            only_formatted = self._format_flight_for_display(flights[0])
+            return {"cheapest": only_formatted} if only_formatted else {}
+
+        # Parse each flight's duration and price once; only the minima are needed
+        decorated = [(self._get_total_duration(f), _flight_price(f), f) for f in flights]
+        cheapest_duration, _, cheapest = min(decorated, key=_BY_PRICE)
+        fastest_duration, _, fastest = min(decorated, key=_BY_DURATION)
 
         result = {}
 
         # Get cheapest option
-        if sorted_by_price:
-            cheapest = sorted_by_price[0]
-            cheapest_formatted = self._format_flight_for_display(cheapest)
-            if cheapest_formatted:  # Only add if formatting succeeded
-                result["cheapest"] = cheapest_formatted
-
-        # Get fastest option (different from cheapest)
-        if len(sorted_by_duration) > 0:
-            fastest = sorted_by_duration[0]
-            # Only show fastest if it's different from cheapest
-            if len(flights) > 1 and fastest != cheapest:
-                fastest_formatted = self._format_flight_for_display(fastest)
-                if fastest_formatted:  # Only add if formatting succeeded
-                    result["fastest"] = fastest_formatted
+        cheapest_formatted = self._format_flight_for_display(cheapest, cheapest_duration)
+        if cheapest_formatted:  # Only add if formatting succeeded
+            result["cheapest"] = cheapest_formatted
+
+        # Get fastest option (only show it if it's different from cheapest)
+        if fastest != cheapest:
+            fastest_formatted = self._format_flight_for_display(fastest, fastest_duration)
+            if fastest_formatted:  # Only add if formatting succeeded
+                result["fastest"] = fastest_formatted
 
         # Calculate price difference if we have both options
         if "fastest" in result and "cheapest" in result:
@@ -120,7 +141,8 @@ class PresentOptionsNode:
 
         return result
 
-    def _format_flight_for_display(self, flight: Dict[str, Any]) -> Dict[str, Any]:
+    def _format_flight_for_display(self, flight: Dict[str, Any],
+                                   duration_minutes: Optional[int] = None) -> Dict[str, Any]:
         """Format single flight for display"""
         price_info = flight.get("price", {})
         itineraries = flight.get("itineraries", [])
@@ -147,8 +169,9 @@ class PresentOptionsNode:
         flight_number = first_segment.get("number", "")
         carrier = f"{carrier_code} {flight_number}" if carrier_code else "Airline"
 
-        # Calculate total duration
-        duration_minutes = self._get_total_duration(flight)
+        # Calculate total duration unless the caller already parsed it
+        if duration_minutes is None:
+            duration_minutes = self._get_total_duration(flight)
 
         # Count stops
         stops = len(segments) - 1
@@ -172,33 +195,15 @@ class PresentOptionsNode:
         """Calculate total flight duration in minutes"""
         itineraries = flight.get("itineraries", [])
         if not itineraries:
-            return 999999  # Large number for sorting
+            return _UNKNOWN_DURATION
 
         # Parse duration from first itinerary (format: PT10H30M)
-        duration_str = itineraries[0].get("duration", "PT0M")
+        match = _DURATION_RE.fullmatch(itineraries[0].get("duration", "PT0M"))
+        if not match:
+            return _UNKNOWN_DURATION
 
-        try:
-            # Remove PT prefix and parse
-            if not duration_str.startswith('PT'):
-                return 999999  # Invalid format
-
-            duration_str = duration_str[2:]  # Remove 'PT'
-            hours = 0
-            minutes = 0
-
-            if 'H' in duration_str:
-                hours_str = duration_str.split('H')[0]
-                hours = int(hours_str)
-                duration_str = duration_str.split('H')[1]
-
-            if 'M' in duration_str:
-                minutes_str = duration_str.split('M')[0]
-                if minutes_str:  # Check for empty string
-                    minutes = int(minutes_str)
-
-            return hours * 60 + minutes
-        except (ValueError, IndexError):
-            return 999999  # Large number for sorting
+        hours, minutes = match.groups()
+        return int(hours or 0) * 60 + int(minutes or 0)
 
     def _handle_empty_results(self, state: TravelState) -> str:
         """Handle cases where no flights were found"""
@@ -232,10 +237,9 @@ class PresentOptionsNode:
 
         if departure_date:
             try:
-                from datetime import datetime
                 date_obj = datetime.fromisoformat(departure_date)
                 summary += f" on {date_obj.strftime('%B %d')}"
-            except:
+            except (TypeError, ValueError):
                 summary += f" on {departure_date}"
 
         if passengers and passengers > 1:
@@ -247,7 +251,7 @@ class PresentOptionsNode:
                 try:
                     ret_date_obj = datetime.fromisoformat(return_date)
                     summary += f" (returning {ret_date_obj.strftime('%B %d')})"
-                except:
+                except (TypeError, ValueError):
                     summary += f" (round-trip)"
             else:
                 summary += " (round-trip)"
@@ -255,6 +259,10 @@ class PresentOptionsNode:
         return summary
 
 
+# Backs present_options_node; the node is stateless, so one instance serves every graph
+_DEFAULT_PRESENT_OPTIONS_NODE = PresentOptionsNode()
+
+
 # Node function for LangGraph integration
 def create_present_options_node():
     """Create PRESENT_OPTIONS node instance"""
@@ -264,5 +272,4 @@ def create_present_options_node():
 # Direct callable for graph registration
 def present_options_node(state: TravelState) -> TravelState:
     """PRESENT_OPTIONS node function for LangGraph StateGraph"""
-    node = PresentOptionsNode()
-    return node(state)
\ No newline at end of file
+    return _DEFAULT_PRESENT_OPTIONS_NODE(state)
\ No newline at end of file
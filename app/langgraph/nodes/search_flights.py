@@ -5,6 +5,7 @@ Executes validated Amadeus API calls and transforms results for presentation.
 Only operates on fully validated state with ready_for_api=True.
 """
 
+import logging
 from typing import Dict, Any, Optional
 
 from app.langgraph.state import (
@@ -17,6 +18,8 @@ from app.langgraph.tools.amadeus_search import AmadeusSearchTool, SearchResult
 from app.amadeus.client import AmadeusClient
 from app.cache.flight_cache import FlightCacheManager
 
+logger = logging.getLogger(__name__)
+
 
 class SearchFlightsNode:
     """SEARCH_FLIGHTS node implementation"""
@@ -28,12 +31,12 @@ class SearchFlightsNode:
 
     def __call__(self, state: TravelState) -> TravelState:
         """Execute flight search with validated parameters"""
-        print(f"[DEBUG] SEARCH_FLIGHTS node executing...")
+        logger.debug("SEARCH_FLIGHTS node executing...")
 
         # CRITICAL: Double-check validation gate
         if not state.get("ready_for_api", False):
-            print(f"[ERROR] CRITICAL: SEARCH_FLIGHTS called without ready_for_api=True")
-            print(f"[ERROR] This should never happen - validation gate bypassed!")
+            logger.error("CRITICAL: SEARCH_FLIGHTS called without ready_for_api=True")
+            logger.error("This should never happen - validation gate bypassed!")
 
             # Emergency fallback - treat as validation error
             error_response = "Internal error - please try your search again."
@@ -45,7 +48,7 @@ class SearchFlightsNode:
 
         # Execute search
         search_result = self.search_tool.search(state)
-        print(f"[DEBUG] Search result: success={search_result.success}, cached={search_result.cached}")
+        logger.debug("Search result: success=%s, cached=%s", search_result.success, search_result.cached)
 
         # Update state based on search outcome
         if search_result.success:
@@ -57,7 +60,7 @@ class SearchFlightsNode:
 
     def _handle_search_success(self, state: TravelState, result: SearchResult) -> TravelState:
         """Handle successful search results"""
-        print(f"[DEBUG] Processing successful search results...")
+        logger.debug("Processing successful search results...")
 
         # Update state with search results
         updated_state = set_search_results(state, result.results, result.cached)
@@ -75,12 +78,12 @@ class SearchFlightsNode:
             response
         )
 
-        print(f"[DEBUG] Search success - results ready for presentation")
+        logger.debug("Search success - results ready for presentation")
         return final_state
 
     def _handle_search_failure(self, state: TravelState, result: SearchResult) -> TravelState:
         """Handle search failures with graceful error messages"""
-        print(f"[DEBUG] Handling search failure: {result.error}")
+        logger.debug("Handling search failure: %s", result.error)
 
         # Generate user-friendly error response
         response = self._generate_error_response(result.error)
@@ -94,7 +97,7 @@ class SearchFlightsNode:
 
         # Don't increment clarification attempts for API failures
         # This wasn't user error, it was system error
-        print(f"[DEBUG] Search failed - returning error response")
+        logger.debug("Search failed - returning error response")
         return final_state
 
     def _generate_cached_response(self, state: TravelState, result: SearchResult) -> str:
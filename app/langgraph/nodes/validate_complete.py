@@ -5,18 +5,32 @@ Critical validation gate that prevents incomplete API calls by ensuring all
 required information is present and valid according to business rules.
 """
 
+import logging
+import re
 from typing import Dict, Any, Optional, List
 
 from app.langgraph.state import (
     TravelState,
-    set_validation_status,
-    set_api_ready,
     update_conversation,
-    set_missing_fields,
     increment_clarification_attempts
 )
 from app.langgraph.tools.validator import create_validator, ValidationResult
 
+logger = logging.getLogger(__name__)
+
+# Prompts for one or two missing required fields, in any order
+_MISSING_INFO_PROMPTS = {
+    frozenset(["origin"]): "Where are you flying from?",
+    frozenset(["destination"]): "Where would you like to go?",
+    frozenset(["departure_date"]): "What date would you like to travel?",
+    frozenset(["origin", "destination"]): "I need to know where you're flying from and where you're going.",
+    frozenset(["origin", "departure_date"]): "I need to know where you're flying from and what date.",
+    frozenset(["destination", "departure_date"]): "I need to know where you're going and what date.",
+}
+
+# Validation errors that take priority when several are reported at once
+_CRITICAL_ERROR_RE = re.compile(r"past|trip type|passenger", re.IGNORECASE)
+
 
 class ValidateCompleteNode:
     """VALIDATE_COMPLETE node implementation"""
@@ -26,13 +40,13 @@ class ValidateCompleteNode:
 
     def __call__(self, state: TravelState) -> TravelState:
         """Validate state completeness and readiness for API call"""
-        print(f"[DEBUG] VALIDATE_COMPLETE node validating state...")
+        logger.debug("VALIDATE_COMPLETE node validating state...")
 
         # Perform comprehensive validation
         validation_result = self.validator.validate(state)
-        print(f"[DEBUG] Validation result: valid={validation_result.is_valid}, ready={validation_result.ready_for_api}")
-        print(f"[DEBUG] Missing: {validation_result.missing_required}")
-        print(f"[DEBUG] Errors: {validation_result.validation_errors}")
+        logger.debug("Validation result: valid=%s, ready=%s", validation_result.is_valid, validation_result.ready_for_api)
+        logger.debug("Missing: %s", validation_result.missing_required)
+        logger.debug("Errors: %s", validation_result.validation_errors)
 
         # Update state with validation results
         updated_state = self._update_state_with_validation(state, validation_result)
@@ -40,10 +54,10 @@ class ValidateCompleteNode:
         # Generate appropriate response based on validation
         if validation_result.ready_for_api:
             response = self._generate_success_response(validation_result)
-            print(f"[DEBUG] VALIDATION PASSED - Ready for API call")
+            logger.debug("VALIDATION PASSED - Ready for API call")
         else:
             response = self._generate_failure_response(validation_result)
-            print(f"[DEBUG] VALIDATION FAILED - Routing to clarification")
+            logger.debug("VALIDATION FAILED - Routing to clarification")
 
         # Update conversation with validation response
         final_state = update_conversation(
@@ -55,21 +69,22 @@ class ValidateCompleteNode:
         return final_state
 
     def _update_state_with_validation(self, state: TravelState, result: ValidationResult) -> TravelState:
-        """Update state with validation results"""
-        updated_state = state
+        """Update state with validation results in a single copy
+
+        Equivalent to set_validation_status, set_api_ready and set_missing_fields
+        applied in turn.
+        """
+        updated_state = dict(state)
 
         # Set validation status
-        updated_state = set_validation_status(
-            updated_state,
-            result.is_valid,
-            result.validation_errors
-        )
+        updated_state["required_fields_complete"] = result.is_valid
+        updated_state["validation_errors"] = result.validation_errors or []
 
         # Set API readiness - this is the critical gate
-        updated_state = set_api_ready(updated_state, result.ready_for_api)
+        updated_state["ready_for_api"] = result.ready_for_api
 
         # Set missing fields for routing decisions
-        updated_state = set_missing_fields(updated_state, result.missing_required)
+        updated_state["missing_fields"] = result.missing_required
 
         return updated_state
 
@@ -90,20 +105,12 @@ class ValidateCompleteNode:
         """Generate response for missing required information"""
         if len(missing_fields) == 1:
             field = missing_fields[0]
-            field_prompts = {
-                "origin": "Where are you flying from?",
-                "destination": "Where would you like to go?",
-                "departure_date": "What date would you like to travel?"
-            }
-            return field_prompts.get(field, f"I still need your {field}.")
+            return _MISSING_INFO_PROMPTS.get(frozenset(missing_fields), f"I still need your {field}.")
 
         elif len(missing_fields) == 2:
-            if "origin" in missing_fields and "destination" in missing_fields:
-                return "I need to know where you're flying from and where you're going."
-            elif "origin" in missing_fields and "departure_date" in missing_fields:
-                return "I need to know where you're flying from and what date."
-            elif "destination" in missing_fields and "departure_date" in missing_fields:
-                return "I need to know where you're going and what date."
+            prompt = _MISSING_INFO_PROMPTS.get(frozenset(missing_fields))
+            if prompt is not None:
+                return prompt
 
         # Multiple missing fields
         missing_text = ", ".join(missing_fields[:-1]) + f", and {missing_fields[-1]}"
@@ -113,28 +120,28 @@ class ValidateCompleteNode:
         """Generate response for validation errors"""
         if len(errors) == 1:
             error = errors[0]
+            error_lower = error.lower()
 
             # Provide helpful responses for common errors
-            if "past" in error.lower():
+            if "past" in error_lower:
                 return "The date you provided is in the past. Could you give me a future date?"
-            elif "same" in error.lower():
+            elif "same" in error_lower:
                 return "The origin and destination appear to be the same. Where would you like to fly to?"
-            elif "return date" in error.lower():
+            elif "return date" in error_lower:
                 return "For a round trip, I need both departure and return dates."
-            elif "trip type" in error.lower():
+            elif "trip type" in error_lower:
                 return "Is this a one-way trip or do you need a return flight?"
-            elif "passenger" in error.lower():
+            elif "passenger" in error_lower:
                 return "How many passengers will be traveling?"
             else:
                 return f"There's an issue: {error}. Could you clarify?"
 
         else:
             # Multiple errors - pick the most critical one
-            critical_errors = [e for e in errors if any(keyword in e.lower()
-                             for keyword in ["past", "trip type", "passenger"])]
+            critical_error = next((e for e in errors if _CRITICAL_ERROR_RE.search(e)), None)
 
-            if critical_errors:
-                return self._generate_error_response([critical_errors[0]])
+            if critical_error is not None:
+                return self._generate_error_response([critical_error])
             else:
                 return f"I found several issues that need clarification: {'; '.join(errors[:2])}."
 
@@ -144,6 +151,10 @@ class ValidateCompleteNode:
         return len(result.validation_errors) > 0
 
 
+# Backs validate_complete_node, which the compiled graph registers directly
+_DEFAULT_VALIDATE_COMPLETE_NODE = ValidateCompleteNode()
+
+
 # Node function for LangGraph integration
 def create_validate_complete_node():
     """Create VALIDATE_COMPLETE node instance"""
@@ -153,5 +164,4 @@ def create_validate_complete_node():
 # Direct callable for graph registration
 def validate_complete_node(state: TravelState) -> TravelState:
     """VALIDATE_COMPLETE node function for LangGraph StateGraph"""
-    node = ValidateCompleteNode()
-    return node(state)
\ No newline at end of file
+    return _DEFAULT_VALIDATE_COMPLETE_NODE(state)
\ No newline at end of file
@@ -8,7 +8,15 @@ travel information collection and validation.
 from typing import Dict, List, Optional, Any, Literal
 from typing_extensions import TypedDict
 from datetime import datetime
-import copy
+
+# Fields add_extracted_info may set from extractor output
+_EXTRACTABLE_FIELDS = frozenset(["origin", "destination", "departure_date", "return_date", "passengers"])
+
+# Fields that must be filled before a flight search, in collection order
+REQUIRED_FIELDS = ("origin", "destination", "departure_date")
+
+# Turns kept in conversation_history; the session is rewritten every turn
+MAX_CONVERSATION_TURNS = 8
 
 
 class TravelState(TypedDict):
@@ -77,29 +85,38 @@ def create_initial_state() -> TravelState:
 
 
 # State Reducer Functions
+#
+# Reducers return a shallow copy of the state and replace, rather than mutate,
+# any container they change, so earlier states never see later updates.
 def add_extracted_info(current: TravelState, update: Dict[str, Any]) -> TravelState:
     """Add extracted travel information to state"""
-    new_state = copy.deepcopy(current)
+    new_state = dict(current)
 
     for field, value in update.items():
-        if field in ["origin", "destination", "departure_date", "return_date", "passengers"]:
-            if value is not None:
-                new_state[field] = value
+        if field in _EXTRACTABLE_FIELDS and value is not None:
+            new_state[field] = value
 
     return new_state
 
 
 def add_field_confidence(current: TravelState, field: str, confidence: float) -> TravelState:
     """Add confidence score for extracted field"""
-    new_state = copy.deepcopy(current)
-    new_state["field_confidence"][field] = confidence
+    new_state = dict(current)
+    new_state["field_confidence"] = {**current["field_confidence"], field: confidence}
+    return new_state
+
+
+def add_field_confidences(current: TravelState, confidences: Dict[str, float]) -> TravelState:
+    """Add confidence scores for several extracted fields in one update"""
+    new_state = dict(current)
+    new_state["field_confidence"] = {**current["field_confidence"], **confidences}
     return new_state
 
 
 def set_trip_type(current: TravelState, trip_type: Literal["one_way", "round_trip"],
                   confirmed: bool = True) -> TravelState:
     """Set trip type with confirmation status"""
-    new_state = copy.deepcopy(current)
+    new_state = dict(current)
     new_state["trip_type"] = trip_type
     new_state["trip_type_confirmed"] = confirmed
     return new_state
@@ -107,14 +124,14 @@ def set_trip_type(current: TravelState, trip_type: Literal["one_way", "round_tri
 
 def increment_clarification_attempts(current: TravelState) -> TravelState:
     """Increment clarification attempt counter"""
-    new_state = copy.deepcopy(current)
+    new_state = dict(current)
     new_state["clarification_attempts"] += 1
     return new_state
 
 
 def set_validation_status(current: TravelState, valid: bool, errors: List[str] = None) -> TravelState:
     """Set validation status and errors"""
-    new_state = copy.deepcopy(current)
+    new_state = dict(current)
     new_state["required_fields_complete"] = valid
     new_state["validation_errors"] = errors or []
     return new_state
@@ -122,25 +139,31 @@ def set_validation_status(current: TravelState, valid: bool, errors: List[str] =
 
 def set_api_ready(current: TravelState, ready: bool) -> TravelState:
     """Set API readiness gate"""
-    new_state = copy.deepcopy(current)
+    new_state = dict(current)
     new_state["ready_for_api"] = ready
     return new_state
 
 
 def update_conversation(current: TravelState, user_msg: str, bot_msg: str) -> TravelState:
-    """Update conversation history and current messages"""
-    new_state = copy.deepcopy(current)
+    """Update conversation history and current messages
+
+    This is the only place turns are appended, so it also trims the history
+    to the last MAX_CONVERSATION_TURNS entries.
+    """
+    new_state = dict(current)
+    history = list(current["conversation_history"])
+    timestamp = datetime.now().isoformat()
 
     # Add previous turn to history if it exists and wasn't already added
     if current["user_message"] and current["bot_response"]:
         # Check if this turn is already in history
-        last_turn = current["conversation_history"][-1] if current["conversation_history"] else {}
+        last_turn = history[-1] if history else {}
         if (last_turn.get("user") != current["user_message"] or
             last_turn.get("bot") != current["bot_response"]):
-            new_state["conversation_history"].append({
+            history.append({
                 "user": current["user_message"],
                 "bot": current["bot_response"],
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             })
 
     # Set current messages
@@ -148,25 +171,26 @@ def update_conversation(current: TravelState, user_msg: str, bot_msg: str) -> Tr
     new_state["bot_response"] = bot_msg
 
     # Add current turn to history
-    new_state["conversation_history"].append({
+    history.append({
         "user": user_msg,
         "bot": bot_msg,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": timestamp
     })
+    new_state["conversation_history"] = history[-MAX_CONVERSATION_TURNS:]
 
     return new_state
 
 
 def set_missing_fields(current: TravelState, missing: List[str]) -> TravelState:
     """Set list of missing required fields"""
-    new_state = copy.deepcopy(current)
+    new_state = dict(current)
     new_state["missing_fields"] = missing
     return new_state
 
 
 def set_search_results(current: TravelState, results: Dict[str, Any], cached: bool = False) -> TravelState:
     """Set search results and cache status"""
-    new_state = copy.deepcopy(current)
+    new_state = dict(current)
     new_state["search_results"] = results
     new_state["search_cached"] = cached
     return new_state
@@ -175,13 +199,29 @@ def set_search_results(current: TravelState, results: Dict[str, Any], cached: bo
 # Helper functions for state analysis
 def get_required_fields() -> List[str]:
     """Get list of required fields for API call"""
-    return ["origin", "destination", "departure_date"]
+    return list(REQUIRED_FIELDS)
+
+
+# Missing-field lists indexed by a bitmask of which required fields are present
+_MISSING_BY_MASK = tuple(
+    tuple(field for bit, field in enumerate(REQUIRED_FIELDS) if not mask >> bit & 1)
+    for mask in range(1 << len(REQUIRED_FIELDS))
+)
+
+
+def get_missing_fields(state: TravelState) -> List[str]:
+    """Get required fields that are still empty, in collection order"""
+    mask = (
+        bool(state.get("origin"))
+        | bool(state.get("destination")) << 1
+        | bool(state.get("departure_date")) << 2
+    )
+    return list(_MISSING_BY_MASK[mask])
 
 
 def has_required_fields(state: TravelState) -> bool:
     """Check if all required fields are present"""
-    required = get_required_fields()
-    return all(state.get(field) is not None for field in required)
+    return all(state.get(field) is not None for field in REQUIRED_FIELDS)
 
 
 def has_trip_type_decision(state: TravelState) -> bool:
@@ -191,21 +231,25 @@ def has_trip_type_decision(state: TravelState) -> bool:
 
 def is_complete_for_api(state: TravelState) -> bool:
     """Check if state is complete for API call"""
-    if not has_required_fields(state):
+    # Departure date is usually the last field collected, so check it first
+    if (
+        state.get("departure_date") is None
+        or state.get("origin") is None
+        or state.get("destination") is None
+    ):
         return False
 
-    if not has_trip_type_decision(state):
+    trip_type = state["trip_type"]
+    if trip_type not in ("one_way", "round_trip") or not state["trip_type_confirmed"]:
         return False
 
     # If round trip, must have return date
-    if state["trip_type"] == "round_trip" and not state.get("return_date"):
+    if trip_type == "round_trip" and not state.get("return_date"):
         return False
 
     # Must have valid passenger count
-    if not state.get("passengers") or state["passengers"] < 1 or state["passengers"] > 9:
-        return False
-
-    return True
+    passengers = state.get("passengers")
+    return bool(passengers) and 1 <= passengers <= 9
 
 
 def get_completion_percentage(state: TravelState) -> float:
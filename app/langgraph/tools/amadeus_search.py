@@ -5,15 +5,61 @@ Structured integration with Amadeus API that only executes with validated parame
 and integrates with existing caching infrastructure for optimal performance.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set, Tuple
 from pydantic import BaseModel
-from datetime import datetime
-import traceback
+from datetime import date, datetime
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+import logging
 
 from app.langgraph.state import TravelState
 from app.amadeus.client import AmadeusClient
 from app.cache.flight_cache import FlightCacheManager
 
+logger = logging.getLogger(__name__)
+
+# Cached fares count as fresh for 1/48 of the time left before departure,
+# clamped to [1 min, 30 min]; stale entries are served for as long again
+# while a background search refreshes them
+_CACHE_FRESH_MIN_SECONDS = 60
+_CACHE_FRESH_MAX_SECONDS = 30 * 60
+_CACHE_FRESH_DIVISOR = 48
+_CACHE_STALE_FACTOR = 2
+
+# Background refreshes of stale cache entries
+_REFRESH_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="flight-refresh")
+
+
+def _cache_fresh_seconds(departure_date: str) -> float:
+    """How long cached results for a departure date stay fresh"""
+    try:
+        until_departure = (datetime.combine(date.fromisoformat(departure_date), datetime.min.time())
+                           - datetime.now()).total_seconds()
+    except (TypeError, ValueError):
+        return _CACHE_FRESH_MAX_SECONDS
+    return min(_CACHE_FRESH_MAX_SECONDS, max(_CACHE_FRESH_MIN_SECONDS, until_departure / _CACHE_FRESH_DIVISOR))
+
+
+# Simple city mappings for common cases
+_CITY_MAPPINGS = {
+    "NEW YORK": "JFK",
+    "NYC": "JFK",
+    "LONDON": "LHR",
+    "LON": "LHR",
+    "PARIS": "CDG",
+    "PAR": "CDG",
+    "LOS ANGELES": "LAX",
+    "LA": "LAX",
+    "TOKYO": "NRT",
+    "CHICAGO": "ORD",
+    "MIAMI": "MIA",
+    "BOSTON": "BOS",
+    "SAN FRANCISCO": "SFO",
+    "WASHINGTON": "DCA",
+    "ATLANTA": "ATL"
+}
+
 
 class SearchParams(BaseModel):
     """Validated search parameters for Amadeus API"""
@@ -26,7 +72,11 @@ class SearchParams(BaseModel):
 
 
 class SearchResult(BaseModel):
-    """Result of flight search operation"""
+    """Result of flight search operation
+
+    Built with model_construct: every field is produced locally, and validating
+    would copy the Amadeus payload in ``results``.
+    """
     success: bool
     results: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
@@ -41,16 +91,22 @@ class AmadeusSearchTool:
     def __init__(self, amadeus_client: AmadeusClient, cache_manager: Optional[FlightCacheManager] = None):
         self.amadeus_client = amadeus_client
         self.cache_manager = cache_manager
+        # Per-instance cache of normalized location -> airport code (users repeat their routes)
+        self._lookup_airport_code = lru_cache(maxsize=256)(self._lookup_airport_code_uncached)
+        # Amadeus calls in progress, keyed like the cache, so identical searches share one request
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = Lock()
+        # Cache keys with a background refresh queued or running
+        self._refreshing: Set[str] = set()
 
     def search(self, state: TravelState) -> SearchResult:
         """Execute flight search with validated state"""
-        print(f"[DEBUG] AmadeusSearchTool.search() called")
+        logger.debug("AmadeusSearchTool.search() called")
 
         # Critical: Verify state is ready for API
         if not state.get("ready_for_api", False):
-            error_msg = "CRITICAL: API call attempted with unvalidated state"
-            print(f"[ERROR] {error_msg}")
-            return SearchResult(
+            logger.error("CRITICAL: API call attempted with unvalidated state")
+            return SearchResult.model_construct(
                 success=False,
                 error="Internal validation error - search blocked",
                 cached=False
@@ -59,10 +115,10 @@ class AmadeusSearchTool:
         # Extract and validate search parameters
         try:
             params = self._extract_search_params(state)
-            print(f"[DEBUG] Search parameters extracted: {params}")
+            logger.debug("Search parameters extracted: %s", params)
         except Exception as e:
-            print(f"[ERROR] Parameter extraction failed: {e}")
-            return SearchResult(
+            logger.error("Parameter extraction failed: %s", e)
+            return SearchResult.model_construct(
                 success=False,
                 error=f"Parameter extraction failed: {str(e)}",
                 cached=False
@@ -72,33 +128,27 @@ class AmadeusSearchTool:
         if self.cache_manager:
             cache_result = self._check_cache(params)
             if cache_result:
-                print(f"[DEBUG] Cache HIT - returning cached results")
+                logger.debug("Cache HIT - returning cached results")
                 return cache_result
 
         # Execute Amadeus API search
         start_time = datetime.now()
         try:
-            print(f"[DEBUG] Executing Amadeus API search...")
+            logger.debug("Executing Amadeus API search...")
 
-            results = self.amadeus_client.search_flights(
-                origin=params.origin,
-                destination=params.destination,
-                dep_date=params.departure_date,
-                ret_date=params.return_date,
-                adults=params.passengers
-            )
+            results, shared = self._fetch_flights(params)
 
             end_time = datetime.now()
             duration_ms = int((end_time - start_time).total_seconds() * 1000)
 
-            print(f"[DEBUG] Amadeus API search completed in {duration_ms}ms")
+            logger.debug("Amadeus API search completed in %sms", duration_ms)
 
-            # Cache the results if cache manager available
+            # Cache the results if cache manager available (the request's owner already did)
             cache_key = None
             if self.cache_manager:
-                cache_key = self._cache_results(params, results)
+                cache_key = self._create_cache_key(params) if shared else self._cache_results(params, results)
 
-            return SearchResult(
+            return SearchResult.model_construct(
                 success=True,
                 results=results,
                 cached=False,
@@ -108,15 +158,48 @@ class AmadeusSearchTool:
 
         except Exception as e:
             error_msg = f"Amadeus API search failed: {str(e)}"
-            print(f"[ERROR] {error_msg}")
-            print(f"[ERROR] Full traceback: {traceback.format_exc()}")
+            logger.exception(error_msg)
 
-            return SearchResult(
+            return SearchResult.model_construct(
                 success=False,
                 error=error_msg,
                 cached=False
             )
 
+    def _fetch_flights(self, params: SearchParams) -> Tuple[Dict[str, Any], bool]:
+        """Call Amadeus, joining an identical request already in flight
+
+        Returns the results and whether they came from another caller's request.
+        """
+        key = self._create_cache_key(params)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            logger.debug("Joining in-flight Amadeus search for key: %s", key)
+            return future.result(), True
+
+        try:
+            results = self.amadeus_client.search_flights(
+                origin=params.origin,
+                destination=params.destination,
+                dep_date=params.departure_date,
+                ret_date=params.return_date,
+                adults=params.passengers
+            )
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(results)
+            return results, False
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
     def _extract_search_params(self, state: TravelState) -> SearchParams:
         """Extract and validate search parameters from state"""
 
@@ -146,34 +229,18 @@ class AmadeusSearchTool:
 
     def _resolve_airport_code(self, location: str) -> str:
         """Resolve location to airport code if needed"""
+        return self._lookup_airport_code(str(location).upper().strip())
+
+    def _lookup_airport_code_uncached(self, location_upper: str) -> str:
+        """Resolve a normalized (upper-cased, stripped) location to an airport code"""
         # Simple resolution - in production you'd use IATA database
-        location_upper = str(location).upper().strip()
 
         # If already looks like airport code, return as-is
         if len(location_upper) == 3 and location_upper.isalpha():
             return location_upper
 
-        # Simple city mappings for common cases
-        city_mappings = {
-            "NEW YORK": "JFK",
-            "NYC": "JFK",
-            "LONDON": "LHR",
-            "LON": "LHR",
-            "PARIS": "CDG",
-            "PAR": "CDG",
-            "LOS ANGELES": "LAX",
-            "LA": "LAX",
-            "TOKYO": "NRT",
-            "CHICAGO": "ORD",
-            "MIAMI": "MIA",
-            "BOSTON": "BOS",
-            "SAN FRANCISCO": "SFO",
-            "WASHINGTON": "DCA",
-            "ATLANTA": "ATL"
-        }
-
-        resolved = city_mappings.get(location_upper, location_upper)
-        print(f"[DEBUG] Resolved '{location}' to '{resolved}'")
+        resolved = _CITY_MAPPINGS.get(location_upper, location_upper)
+        logger.debug("Resolved '%s' to '%s'", location_upper, resolved)
         return resolved
 
     def _check_cache(self, params: SearchParams) -> Optional[SearchResult]:
@@ -183,21 +250,47 @@ class AmadeusSearchTool:
 
         try:
             cache_key = self._create_cache_key(params)
-            cached_results = self.cache_manager.get_cached_results(cache_key)
+            fresh_minutes = _cache_fresh_seconds(params.departure_date) / 60
+            cached_results = self.cache_manager.get_cached_results(
+                cache_key,
+                max_age_minutes=fresh_minutes * _CACHE_STALE_FACTOR,
+                stale_after_minutes=fresh_minutes,
+                on_stale=lambda: self._schedule_refresh(params, cache_key)
+            )
 
             if cached_results:
-                print(f"[DEBUG] Found cached results for key: {cache_key}")
-                return SearchResult(
+                logger.debug("Found cached results for key: %s", cache_key)
+                return SearchResult.model_construct(
                     success=True,
                     results=cached_results,
                     cached=True,
                     cache_key=cache_key
                 )
         except Exception as e:
-            print(f"[WARNING] Cache check failed: {e}")
+            logger.warning("Cache check failed: %s", e)
 
         return None
 
+    def _schedule_refresh(self, params: SearchParams, cache_key: str) -> None:
+        """Re-run a search in the background to replace a stale cache entry"""
+        with self._inflight_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+        logger.debug("Serving stale cache entry, refreshing key: %s", cache_key)
+        _REFRESH_EXECUTOR.submit(self._refresh_cache, params, cache_key)
+
+    def _refresh_cache(self, params: SearchParams, cache_key: str) -> None:
+        try:
+            results, shared = self._fetch_flights(params)
+            if not shared:
+                self._cache_results(params, results)
+        except Exception as e:
+            logger.warning("Background cache refresh failed for %s: %s", cache_key, e)
+        finally:
+            with self._inflight_lock:
+                self._refreshing.discard(cache_key)
+
     def _cache_results(self, params: SearchParams, results: Dict[str, Any]) -> Optional[str]:
         """Cache search results for future use"""
         if not self.cache_manager:
@@ -206,10 +299,10 @@ class AmadeusSearchTool:
         try:
             cache_key = self._create_cache_key(params)
             self.cache_manager.cache_results(cache_key, results)
-            print(f"[DEBUG] Cached results with key: {cache_key}")
+            logger.debug("Cached results with key: %s", cache_key)
             return cache_key
         except Exception as e:
-            print(f"[WARNING] Caching failed: {e}")
+            logger.warning("Caching failed: %s", e)
             return None
 
     def _create_cache_key(self, params: SearchParams) -> str:
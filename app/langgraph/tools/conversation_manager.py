@@ -10,8 +10,43 @@ from pydantic import BaseModel
 # from langchain_core.tools import BaseTool  # Simplified for now
 import re
 from datetime import datetime, timedelta
+from itertools import product
 
-from app.langgraph.state import TravelState, get_required_fields, has_required_fields, has_trip_type_decision
+from app.langgraph.state import TravelState, get_missing_fields, get_required_fields, has_required_fields, has_trip_type_decision
+
+
+# Greeting and confirmation patterns combined so a message is classified in one match
+_MESSAGE_KIND_RE = re.compile(
+    r"^(?:"
+    r"(?P<greeting>hi|hello|hey|good\s+(?:morning|afternoon|evening)|greetings?|howdy|what's up|sup|yo)"
+    r"|(?P<confirmation>yes|yep|yeah|correct|right|perfect|exactly|that's right|looks good|confirm"
+    r"|ok|okay|alright|sure|sounds good)"
+    r")(?:\s|!|\.)?$",
+    re.I
+)
+
+
+def _build_missing_info_templates() -> Dict[tuple, str]:
+    """Question templates keyed by (primary missing field, has origin, has destination)"""
+    templates = {}
+    for has_origin, has_destination in product((False, True), repeat=2):
+        # Context-aware questions based on what we already know
+        templates[("origin", has_origin, has_destination)] = (
+            "Perfect! You want to go to {destination}. Where are you flying from?"
+            if has_destination else "Where are you flying from?"
+        )
+        templates[("destination", has_origin, has_destination)] = (
+            "Great! Flying from {origin}. Where would you like to go?"
+            if has_origin else "Where would you like to go?"
+        )
+        templates[("departure_date", has_origin, has_destination)] = (
+            "Excellent! {origin} to {destination}. What date would you like to travel?"
+            if has_origin and has_destination else "When would you like to travel?"
+        )
+    return templates
+
+
+_MISSING_INFO_TEMPLATES = _build_missing_info_templates()
 
 
 class ConversationAction(BaseModel):
@@ -29,12 +64,14 @@ class ConversationManagerTool:
     def _run(self, state: TravelState, extraction_result: Optional[Dict] = None) -> ConversationAction:
         """Generate appropriate conversational response based on state"""
 
+        message_kind = self._classify_message(state["user_message"])
+
         # Handle greetings first
-        if self._is_greeting(state["user_message"]):
+        if message_kind == "greeting":
             return self._generate_greeting_response()
 
         # Handle confirmations
-        if self._is_confirmation(state["user_message"]):
+        if message_kind == "confirmation":
             return self._generate_confirmation_response(state)
 
         # Check if we have extraction results to acknowledge
@@ -56,23 +93,18 @@ class ConversationManagerTool:
         # If everything looks complete, generate confirmation
         return self._generate_final_confirmation(state)
 
+    def _classify_message(self, message: str) -> Optional[str]:
+        """Classify message as 'greeting', 'confirmation' or None"""
+        match = _MESSAGE_KIND_RE.match(message.strip())
+        return match.lastgroup if match else None
+
     def _is_greeting(self, message: str) -> bool:
         """Check if message is a greeting"""
-        greeting_patterns = [
-            r'^(hi|hello|hey|good\s+(morning|afternoon|evening)|greetings?|howdy)(?:\s|!|\.)?$',
-            r'^(what\'s up|sup|yo)(?:\s|!|\.)?$'
-        ]
-        message_lower = message.lower().strip()
-        return any(re.match(pattern, message_lower, re.I) for pattern in greeting_patterns)
+        return self._classify_message(message) == "greeting"
 
     def _is_confirmation(self, message: str) -> bool:
         """Check if message is a confirmation"""
-        confirmation_patterns = [
-            r'^(yes|yep|yeah|correct|right|perfect|exactly|that\'s right|looks good|confirm)(?:\s|!|\.)?$',
-            r'^(ok|okay|alright|sure|sounds good)(?:\s|!|\.)?$'
-        ]
-        message_lower = message.lower().strip()
-        return any(re.match(pattern, message_lower, re.I) for pattern in confirmation_patterns)
+        return self._classify_message(message) == "confirmation"
 
     def _generate_greeting_response(self) -> ConversationAction:
         """Generate friendly greeting response"""
@@ -168,21 +200,8 @@ class ConversationManagerTool:
 
     def _get_missing_critical_info(self, state: TravelState) -> List[str]:
         """Get list of missing critical information"""
-        missing = []
-
-        if not state.get("origin"):
-            missing.append("origin")
-        if not state.get("destination"):
-            missing.append("destination")
-        if not state.get("departure_date"):
-            missing.append("departure_date")
-
-        # Check passenger count (default to 1 if not specified)
-        if not state.get("passengers"):
-            # Don't consider this critical missing - we can default to 1
-            pass
-
-        return missing
+        # Passenger count is not critical - it defaults to 1
+        return get_missing_fields(state)
 
     def _generate_missing_info_question(self, state: TravelState, missing_fields: List[str]) -> ConversationAction:
         """Generate question for missing information"""
@@ -201,44 +220,17 @@ class ConversationManagerTool:
         if not missing_fields:
             return "I have all the information I need!"
 
-        # Context-aware questions based on what we already know
         origin = state.get("origin")
         destination = state.get("destination")
-        departure_date = state.get("departure_date")
-
         primary_missing = missing_fields[0]
-        print(f"[DEBUG] Question selection: primary_missing='{primary_missing}', origin='{origin}', destination='{destination}', date='{departure_date}'")
-
-        if primary_missing == "origin" and destination:
-            question = f"Perfect! You want to go to {destination}. Where are you flying from?"
-            print(f"[DEBUG] Selected question type: origin with destination context")
-            return question
-
-        elif primary_missing == "destination" and origin:
-            question = f"Great! Flying from {origin}. Where would you like to go?"
-            print(f"[DEBUG] Selected question type: destination with origin context")
-            return question
-
-        elif primary_missing == "departure_date" and origin and destination:
-            question = f"Excellent! {origin} to {destination}. What date would you like to travel?"
-            print(f"[DEBUG] Selected question type: date with full context")
-            return question
-
-        elif primary_missing == "departure_date":
-            question = "When would you like to travel?"
-            print(f"[DEBUG] Selected question type: date only - THIS IS WRONG FOR GREETING!")
-            return question
-
-        # Fallback questions
-        question_map = {
-            "origin": "Where are you flying from?",
-            "destination": "Where would you like to go?",
-            "departure_date": "When would you like to depart?"
-        }
 
-        fallback_question = question_map.get(primary_missing, "Could you provide more details about your trip?")
-        print(f"[DEBUG] Selected fallback question for '{primary_missing}': {fallback_question}")
-        return fallback_question
+        template = _MISSING_INFO_TEMPLATES.get((primary_missing, bool(origin), bool(destination)))
+        if template is None:
+            return "Could you provide more details about your trip?"
+
+        question = template.format_map({"origin": origin, "destination": destination})
+        print(f"[DEBUG] Question selection: primary_missing='{primary_missing}' -> {question}")
+        return question
 
     def _generate_trip_type_question(self, state: TravelState) -> ConversationAction:
         """Generate question about trip type (one-way vs round-trip)"""
@@ -5,14 +5,59 @@ Combines fast regex parsing with LLM extraction for robust travel entity recogni
 with confidence scoring and ambiguity detection.
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, TYPE_CHECKING
+from collections import OrderedDict
+from threading import Lock
 from pydantic import BaseModel
 # from langchain_core.tools import BaseTool  # Simplified for now
-from langchain_openai import ChatOpenAI
+import logging
 import re
 from datetime import datetime
 
-from app.langgraph.state import TravelState
+from app.langgraph.state import REQUIRED_FIELDS, TravelState, has_required_fields
+from app.obs.metrics import inc_counter
+from app.utils.dates import to_iso_date
+
+if TYPE_CHECKING:
+    # langchain_openai is slow to import and only needed for annotations here
+    from langchain_openai import ChatOpenAI
+
+
+logger = logging.getLogger(__name__)
+
+# Short messages ("yes", "tomorrow", "2 people") repeat a lot; their LLM results are cached
+_LLM_CACHE_MAX_ENTRIES = 2048
+_LLM_CACHE_MAX_MESSAGE_LEN = 64
+
+# State the extraction prompt is built from, so a cached result is only reused in the same context
+_LLM_CONTEXT_FIELDS = ("origin", "destination", "departure_date", "return_date", "passengers", "trip_type")
+
+# Context extraction only accepts simple one-to-three word city names
+_SINGLE_CITY_RE = re.compile(r'^([A-Za-z]{3,}(?:\s+[A-Za-z]+){0,2})$')
+
+# Common greetings/non-travel words that must never become travel fields
+_FORBIDDEN_CONTEXT_WORDS = frozenset({
+    'hello', 'hi', 'hey', 'good', 'morning', 'afternoon', 'evening', 'thanks', 'thank', 'you',
+    'please', 'yes', 'no', 'okay', 'ok', 'sure', 'great', 'perfect', 'excellent', 'nice'
+})
+
+# Phrases in the last bot message that show which field a one-word reply answers
+_CONTEXT_CUE_RE = re.compile(
+    r"(?P<origin>flying from)|(?P<destination>where would you like to go|where to|destination)"
+)
+
+# Bare acknowledgements carry no travel entities worth an LLM round-trip
+_ACKNOWLEDGEMENT_RE = re.compile(
+    r"^(yes|yep|yeah|no|nope|correct|right|perfect|exactly|that's right|looks good|confirm|"
+    r"ok|okay|alright|sure|sounds good|thanks|thank you)(?:\s|!|\.)?$",
+    re.I
+)
+
+# Short replies the LLM has nothing to add to: yes/no, or a count or day fast parse reads itself
+_SIMPLE_REPLY_RE = re.compile(
+    r"^(?:yes|no|\d+\s*(?:adults?|pax|people|passengers?)|tomorrow|today)(?:\s|!|\.)?$",
+    re.I
+)
 
 
 class ExtractionResult(BaseModel):
@@ -24,24 +69,99 @@ class ExtractionResult(BaseModel):
     extraction_method: str  # "fast_parse", "llm", "hybrid"
 
 
+# Correction handlers: apply one matched correction pattern to the corrections dict
+def _apply_date_correction(match: re.Match, corrections: Dict[str, Any]) -> None:
+    # A number followed by "adults"/"people" is a passenger count, not a day of the month
+    if _PASSENGERS_RE.match(match.string, match.start(1)):
+        return
+
+    # Parse the new date
+    new_date = to_iso_date(match.group(1))
+    if new_date:
+        corrections["departure_date"] = new_date
+
+
+def _apply_change_destination(match: re.Match, corrections: Dict[str, Any]) -> None:
+    corrections["destination"] = match.group(1).strip().upper()
+
+
+def _apply_change_origin(match: re.Match, corrections: Dict[str, Any]) -> None:
+    corrections["origin"] = match.group(1).strip().upper()
+
+
+def _apply_change_passengers(match: re.Match, corrections: Dict[str, Any]) -> None:
+    try:
+        new_count = int(match.group(1))
+        if 1 <= new_count <= 9:
+            corrections["passengers"] = new_count
+    except ValueError:
+        pass
+
+
+def _apply_add_return(match: re.Match, corrections: Dict[str, Any]) -> None:
+    return_date = to_iso_date(match.group(1))
+    if return_date:
+        corrections["return_date"] = return_date
+        corrections["trip_type"] = "round_trip"
+
+
+def _apply_make_oneway(match: re.Match, corrections: Dict[str, Any]) -> None:
+    corrections["trip_type"] = "one_way"
+    corrections["return_date"] = None
+
+
+def _apply_make_roundtrip(match: re.Match, corrections: Dict[str, Any]) -> None:
+    corrections["trip_type"] = "round_trip"
+
+
+def _llm_cache_key(message: str, current_state: Optional[TravelState]) -> Optional[Tuple]:
+    """Key an LLM extraction on the normalised message plus the state it was made against"""
+    normalized = " ".join(message.lower().split())
+    if len(normalized) > _LLM_CACHE_MAX_MESSAGE_LEN:
+        return None
+
+    state = current_state or {}
+    history = state.get("conversation_history") or []
+    last_bot_message = history[-1].get("bot") if history else None
+    return (normalized, last_bot_message, *(state.get(field) for field in _LLM_CONTEXT_FIELDS))
+
+
+# Compiled once at import; fast parse and correction detection run every turn
+_FROM_TO_RE = re.compile(r'from\s+([A-Z]{3}|\w+)\s+to\s+([A-Z]{3}|\w+)', re.I)
+_DATE_RE = re.compile(r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\w+\s+\d{1,2}(?:st|nd|rd|th)?)', re.I)
+_RELATIVE_DATE_RE = re.compile(r'\b(today|tomorrow)\b', re.I)
+_PASSENGERS_RE = re.compile(r'(\d+)\s*(?:passengers?|people|persons?|pax|adults?)', re.I)
+
+_CORRECTION_PATTERNS: Dict[str, re.Pattern] = {
+    "date_correction": re.compile(r"(?:no,?\s+)?(?:on\s+)?(?:the\s+)?(\d+(?:st|nd|rd|th)?|\w+\s+\d+|[A-Za-z]+\s+\d+)", re.I),
+    "change_destination": re.compile(r"(?:change|make|switch).*(?:to|destination).*?([A-Z]{3}|[A-Za-z]+)", re.I),
+    "change_origin": re.compile(r"(?:change|make|switch).*(?:from|origin).*?([A-Z]{3}|[A-Za-z]+)", re.I),
+    "change_passengers": re.compile(r"(?:change|make|now|actually).*?(\d+).*?(?:people|passengers|adults|person)", re.I),
+    "add_return": re.compile(r"(?:add|include|with|need).*?return.*?(?:on\s+)?(\d+|\w+\s+\d+)", re.I),
+    "make_oneway": re.compile(r"(?:one.way|oneway|no return|just one way)", re.I),
+    "make_roundtrip": re.compile(r"(?:round.trip|roundtrip|return|coming back)", re.I),
+}
+
+
+_CORRECTION_HANDLERS = {
+    "date_correction": _apply_date_correction,
+    "change_destination": _apply_change_destination,
+    "change_origin": _apply_change_origin,
+    "change_passengers": _apply_change_passengers,
+    "add_return": _apply_add_return,
+    "make_oneway": _apply_make_oneway,
+    "make_roundtrip": _apply_make_roundtrip,
+}
+
+
 class InformationExtractorTool:
     """Extract travel entities with confidence scoring"""
 
-    def __init__(self, llm: Optional[ChatOpenAI] = None):
+    def __init__(self, llm: Optional["ChatOpenAI"] = None):
         self.llm = llm
-        self.correction_patterns = self._compile_correction_patterns()
-
-    def _compile_correction_patterns(self) -> Dict[str, re.Pattern]:
-        """Compile patterns for detecting corrections and modifications"""
-        return {
-            "date_correction": re.compile(r"(?:no,?\s+)?(?:on\s+)?(?:the\s+)?(\d+(?:st|nd|rd|th)?|\w+\s+\d+|[A-Za-z]+\s+\d+)", re.I),
-            "change_destination": re.compile(r"(?:change|make|switch).*(?:to|destination).*?([A-Z]{3}|[A-Za-z]+)", re.I),
-            "change_origin": re.compile(r"(?:change|make|switch).*(?:from|origin).*?([A-Z]{3}|[A-Za-z]+)", re.I),
-            "change_passengers": re.compile(r"(?:change|make|now|actually).*?(\d+).*?(?:people|passengers|adults|person)", re.I),
-            "add_return": re.compile(r"(?:add|include|with|need).*?return.*?(?:on\s+)?(\d+|\w+\s+\d+)", re.I),
-            "make_oneway": re.compile(r"(?:one.way|oneway|no return|just one way)", re.I),
-            "make_roundtrip": re.compile(r"(?:round.trip|roundtrip|return|coming back)", re.I),
-        }
+        self.correction_patterns = _CORRECTION_PATTERNS
+        self._llm_cache: "OrderedDict[Tuple, Optional[Dict[str, Any]]]" = OrderedDict()
+        self._llm_cache_lock = Lock()
 
     def _run(self, message: str, current_state: TravelState) -> ExtractionResult:
         """Extract travel information from user message"""
@@ -49,17 +169,44 @@ class InformationExtractorTool:
         # First try fast parse for structured inputs
         fast_result = self._try_fast_parse(message, current_state)
 
-        # Then try LLM for natural language with context
-        llm_result = self._try_llm_extraction(message, current_state) if self.llm else None
-
         # Detect corrections to existing state
         corrections = self._detect_corrections(message, current_state)
 
+        # Then use the LLM for natural language with context, unless it has nothing left to add
+        llm_result = None
+        if self.llm:
+            if self._is_simple_reply(message):
+                inc_counter("llm_extraction_skipped", {"reason": "simple_reply"})
+            elif self._needs_llm_extraction(message, fast_result, current_state):
+                llm_result = self._try_llm_extraction(message, current_state)
+
         # Combine results intelligently
         final_result = self._combine_results(fast_result, llm_result, corrections, current_state)
 
         return final_result
 
+    def _needs_llm_extraction(self, message: str, fast_result: Optional[Dict[str, Any]],
+                              current_state: TravelState) -> bool:
+        """Check whether the LLM could add anything beyond fast parse and known state"""
+        fast_fields = fast_result["fields"] if fast_result else {}
+        if all(fast_fields.get(field) for field in REQUIRED_FIELDS):
+            logger.debug("Fast parse covered the required fields - skipping LLM extraction")
+            inc_counter("llm_extraction_skipped", {"reason": "fields_covered"})
+            return False
+
+        # Confirming a trip whose required fields are already known leaves nothing to extract;
+        # any other message may be a free-text edit ("actually make it Rome")
+        if _ACKNOWLEDGEMENT_RE.match(message.strip()) and has_required_fields(current_state or {}):
+            logger.debug("Confirmation of a complete trip - skipping LLM extraction")
+            inc_counter("llm_extraction_skipped", {"reason": "confirmation"})
+            return False
+
+        return True
+
+    def _is_simple_reply(self, message: str) -> bool:
+        """Check for yes/no and one-token answers the LLM has nothing to add to"""
+        return bool(_SIMPLE_REPLY_RE.match(message.strip()))
+
     def _try_fast_parse(self, message: str, current_state: TravelState = None) -> Optional[Dict[str, Any]]:
         """Try fast regex-based parsing with inline patterns and context awareness"""
         try:
@@ -71,18 +218,21 @@ class InformationExtractorTool:
             }
 
             # Origin/destination patterns
-            from_to = re.search(r'from\s+([A-Z]{3}|\w+)\s+to\s+([A-Z]{3}|\w+)', message, re.I)
+            from_to = _FROM_TO_RE.search(message)
             if from_to:
                 result["fields"]["origin"] = from_to.group(1).upper()
                 result["fields"]["destination"] = from_to.group(2).upper()
 
-            # Date patterns
-            date_match = re.search(r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\w+\s+\d{1,2}(?:st|nd|rd|th)?)', message, re.I)
-            if date_match:
+            # Date patterns; "today"/"tomorrow" resolve against the current date
+            relative_date = _RELATIVE_DATE_RE.search(message)
+            date_match = _DATE_RE.search(message)
+            if relative_date:
+                result["fields"]["departure_date"] = to_iso_date(relative_date.group(1))
+            elif date_match:
                 result["fields"]["departure_date"] = date_match.group(1)
 
             # Passenger patterns
-            pax_match = re.search(r'(\d+)\s*(?:passengers?|people|persons?|pax)', message, re.I)
+            pax_match = _PASSENGERS_RE.search(message)
             if pax_match:
                 result["fields"]["passengers"] = int(pax_match.group(1))
 
@@ -100,7 +250,7 @@ class InformationExtractorTool:
         """PHASE 1: Ultra-conservative context-aware extraction with strict safety constraints"""
         try:
             # SAFETY CHECK 1: Only process simple single city names
-            single_city_match = re.match(r'^([A-Za-z]{3,}(?:\s+[A-Za-z]+){0,2})$', message.strip())
+            single_city_match = _SINGLE_CITY_RE.match(message.strip())
             if not single_city_match:
                 print(f"[DEBUG] Context extraction: '{message}' is not a simple city name - skipping")
                 return
@@ -108,11 +258,7 @@ class InformationExtractorTool:
             city_name = single_city_match.group(1).strip()
 
             # SAFETY CHECK 1.5: Never extract common greetings/non-travel words as travel fields
-            forbidden_words = {
-                'hello', 'hi', 'hey', 'good', 'morning', 'afternoon', 'evening', 'thanks', 'thank', 'you',
-                'please', 'yes', 'no', 'okay', 'ok', 'sure', 'great', 'perfect', 'excellent', 'nice'
-            }
-            if city_name.lower() in forbidden_words:
+            if city_name.lower() in _FORBIDDEN_CONTEXT_WORDS:
                 print(f"[DEBUG] Context extraction: '{city_name}' is a forbidden word - never extract as travel field")
                 return
 
@@ -143,17 +289,17 @@ class InformationExtractorTool:
             extracted_field = None
             extracted_value = None
 
+            # Which fields the bot's question asks about, in one scan of the message
+            asked = {match.lastgroup for match in _CONTEXT_CUE_RE.finditer(last_bot_message)}
+
             # Case 1: Bot asked for origin, map to origin (if not already set)
-            if ("where are you flying from" in last_bot_message or
-                "flying from" in last_bot_message) and not current_origin:
+            if "origin" in asked and not current_origin:
                 extracted_field = "origin"
                 extracted_value = city_name.upper()
                 print(f"[DEBUG] Context extraction: Bot asked for origin, mapping '{city_name}' to origin")
 
             # Case 2: Bot asked for destination, map to destination (if not already set)
-            elif ("where would you like to go" in last_bot_message or
-                  "where to" in last_bot_message or
-                  "destination" in last_bot_message) and not current_destination:
+            elif "destination" in asked and not current_destination:
                 extracted_field = "destination"
                 extracted_value = city_name.upper()
                 print(f"[DEBUG] Context extraction: Bot asked for destination, mapping '{city_name}' to destination")
@@ -185,10 +331,29 @@ class InformationExtractorTool:
             # Fail safely - don't extract anything if there's an error
 
     def _try_llm_extraction(self, message: str, current_state: TravelState = None) -> Optional[Dict[str, Any]]:
-        """Try LLM-based extraction - temporarily disabled to isolate issues"""
+        """Try LLM-based extraction, serving repeated short messages from an LRU cache"""
         if not self.llm:
             return None
 
+        key = _llm_cache_key(message, current_state)
+        if key is None:
+            return self._call_llm_extraction(message, current_state)
+
+        with self._llm_cache_lock:
+            if key in self._llm_cache:
+                self._llm_cache.move_to_end(key)
+                return self._llm_cache[key]
+
+        # Empty results are cached too: most repeats are messages with nothing to extract
+        result = self._call_llm_extraction(message, current_state)
+        with self._llm_cache_lock:
+            self._llm_cache[key] = result
+            if len(self._llm_cache) > _LLM_CACHE_MAX_ENTRIES:
+                self._llm_cache.popitem(last=False)
+        return result
+
+    def _call_llm_extraction(self, message: str, current_state: TravelState = None) -> Optional[Dict[str, Any]]:
+        """LLM extraction call - temporarily disabled to isolate issues"""
         # TEMPORARILY DISABLED: Return None to isolate if LLM extraction is causing issues
         print(f"[DEBUG] LLM extraction temporarily disabled for isolation testing")
         return None
@@ -200,44 +365,7 @@ class InformationExtractorTool:
         for correction_type, pattern in self.correction_patterns.items():
             match = pattern.search(message)
             if match:
-                if correction_type == "date_correction":
-                    # Parse the new date
-                    from app.utils.dates import to_iso_date
-                    date_str = match.group(1)
-                    new_date = to_iso_date(date_str)
-                    if new_date:
-                        corrections["departure_date"] = new_date
-
-                elif correction_type == "change_destination":
-                    new_dest = match.group(1).strip().upper()
-                    corrections["destination"] = new_dest
-
-                elif correction_type == "change_origin":
-                    new_origin = match.group(1).strip().upper()
-                    corrections["origin"] = new_origin
-
-                elif correction_type == "change_passengers":
-                    try:
-                        new_count = int(match.group(1))
-                        if 1 <= new_count <= 9:
-                            corrections["passengers"] = new_count
-                    except ValueError:
-                        pass
-
-                elif correction_type == "add_return":
-                    from app.utils.dates import to_iso_date
-                    date_str = match.group(1)
-                    return_date = to_iso_date(date_str)
-                    if return_date:
-                        corrections["return_date"] = return_date
-                        corrections["trip_type"] = "round_trip"
-
-                elif correction_type == "make_oneway":
-                    corrections["trip_type"] = "one_way"
-                    corrections["return_date"] = None
-
-                elif correction_type == "make_roundtrip":
-                    corrections["trip_type"] = "round_trip"
+                _CORRECTION_HANDLERS[correction_type](match, corrections)
 
         return corrections
 
@@ -254,16 +382,16 @@ class InformationExtractorTool:
         # Apply corrections first (highest priority)
         if corrections:
             extracted_fields.update(corrections)
-            for field in corrections:
-                field_confidence[field] = 0.98  # Very high confidence for explicit corrections
+            field_confidence.update(dict.fromkeys(corrections, 0.98))  # Very high confidence for explicit corrections
             method = "correction"
 
         # Apply fast parse results (high confidence)
         if fast_result:
-            for field, value in fast_result["fields"].items():
-                if field not in extracted_fields:  # Don't override corrections
-                    extracted_fields[field] = value
-                    field_confidence[field] = fast_result["confidence"]
+            # Don't override corrections
+            new_fields = {field: value for field, value in fast_result["fields"].items()
+                          if field not in extracted_fields}
+            extracted_fields |= new_fields
+            field_confidence |= dict.fromkeys(new_fields, fast_result["confidence"])
             method = "fast_parse" if method == "none" else f"{method}+fast_parse"
 
         # Apply LLM results (lower confidence, fill gaps)
@@ -284,7 +412,8 @@ class InformationExtractorTool:
         # Detect ambiguities and suggest clarifications
         self._detect_ambiguities(extracted_fields, field_confidence, ambiguous_fields, suggested_clarifications)
 
-        return ExtractionResult(
+        # Fields are built locally with the right types, so skip re-validation
+        return ExtractionResult.model_construct(
             extracted_fields=extracted_fields,
             field_confidence=field_confidence,
             ambiguous_fields=ambiguous_fields,
@@ -315,6 +444,6 @@ class InformationExtractorTool:
 
 
 # Helper function to create tool with LLM
-def create_extraction_tool(llm: Optional[ChatOpenAI] = None) -> InformationExtractorTool:
+def create_extraction_tool(llm: Optional["ChatOpenAI"] = None) -> InformationExtractorTool:
     """Create information extraction tool with optional LLM"""
     return InformationExtractorTool(llm=llm)
\ No newline at end of file
@@ -10,7 +10,17 @@ from pydantic import BaseModel
 from datetime import datetime, timedelta
 import re
 
-from app.langgraph.state import TravelState, get_required_fields, has_required_fields, has_trip_type_decision
+from app.langgraph.state import TravelState, get_missing_fields, get_required_fields, has_required_fields, has_trip_type_decision
+
+
+# Metro-area airport hints for city names, keyed by lower-cased city
+_NEW_YORK_HINT = "Consider using airport code JFK, LGA, or EWR for New York"
+_AIRPORT_CODE_HINTS = {
+    "new york": _NEW_YORK_HINT,
+    "nyc": _NEW_YORK_HINT,
+    "london": "Consider using airport code LHR, LGW, or STN for London",
+    "paris": "Consider using airport code CDG or ORY for Paris",
+}
 
 
 class ValidationResult(BaseModel):
@@ -57,7 +67,8 @@ class StateValidatorTool:
         is_valid = len(missing_required) == 0 and len(validation_errors) == 0
         ready_for_api = is_valid and has_trip_type_decision(state)
 
-        return ValidationResult(
+        # Fields are built locally with the right types, so skip re-validation
+        return ValidationResult.model_construct(
             is_valid=is_valid,
             missing_required=missing_required,
             validation_errors=validation_errors,
@@ -67,16 +78,7 @@ class StateValidatorTool:
 
     def _validate_required_fields(self, state: TravelState) -> List[str]:
         """Validate presence of required fields"""
-        missing = []
-
-        if not state.get("origin"):
-            missing.append("origin")
-        if not state.get("destination"):
-            missing.append("destination")
-        if not state.get("departure_date"):
-            missing.append("departure_date")
-
-        return missing
+        return get_missing_fields(state)
 
     def _validate_field_formats(self, state: TravelState) -> List[str]:
         """Validate field formats and content"""
@@ -221,21 +223,11 @@ class StateValidatorTool:
         origin = str(state.get("origin", "")).strip()
         destination = str(state.get("destination", "")).strip()
 
-        if origin and not self.airport_code_pattern.match(origin.upper()):
-            if origin.lower() in ["new york", "nyc"]:
-                recommendations.append("Consider using airport code JFK, LGA, or EWR for New York")
-            elif origin.lower() in ["london"]:
-                recommendations.append("Consider using airport code LHR, LGW, or STN for London")
-            elif origin.lower() in ["paris"]:
-                recommendations.append("Consider using airport code CDG or ORY for Paris")
-
-        if destination and not self.airport_code_pattern.match(destination.upper()):
-            if destination.lower() in ["new york", "nyc"]:
-                recommendations.append("Consider using airport code JFK, LGA, or EWR for New York")
-            elif destination.lower() in ["london"]:
-                recommendations.append("Consider using airport code LHR, LGW, or STN for London")
-            elif destination.lower() in ["paris"]:
-                recommendations.append("Consider using airport code CDG or ORY for Paris")
+        for location in (origin, destination):
+            if location and not self.airport_code_pattern.match(location.upper()):
+                hint = _AIRPORT_CODE_HINTS.get(location.lower())
+                if hint:
+                    recommendations.append(hint)
 
         # Recommend advance booking
         if state.get("departure_date"):
@@ -1,9 +1,21 @@
-import json
+import logging
+import orjson
 import redis
 from typing import Dict, Optional, Any
 from datetime import datetime, timedelta
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+SCAN_BATCH_SIZE = 100
+
+# orjson rejects non-str keys by default; stdlib json coerced them, so keep that
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _dumps(value: Any) -> bytes:
+    return orjson.dumps(value, option=_ORJSON_OPTIONS)
+
 
 class RedisSessionStore:
     def __init__(self, redis_url: str = None, ttl_seconds: int = None):
@@ -19,56 +31,56 @@ class RedisSessionStore:
             # Fall back to in-memory if Redis is not available
             self.client = None
             self._fallback_store = {}
-            print("[WARNING] Redis not available, falling back to in-memory storage")
+            logger.warning("Redis not available, falling back to in-memory storage")
 
     def _get_key(self, user_id: str) -> str:
         return f"{self.prefix}{user_id}"
 
     def get(self, user_id: str) -> Optional[Dict[str, Any]]:
-        print(f"[DEBUG] RedisStore.get() called for user_id: {user_id}")
+        logger.debug("RedisStore.get() called for user_id: %s", user_id)
         if self.client is None:
-            print(f"[DEBUG] Using fallback store")
+            logger.debug("Using fallback store")
             result = self._fallback_store.get(user_id)
-            print(f"[DEBUG] Fallback store result: {result}")
+            logger.debug("Fallback store result: %s", result)
             return result
 
         key = self._get_key(user_id)
-        print(f"[DEBUG] Redis key: {key}")
+        logger.debug("Redis key: %s", key)
         try:
             data = self.client.get(key)
-            print(f"[DEBUG] Raw Redis data: {data}")
+            logger.debug("Raw Redis data: %s", data)
             if data:
-                result = json.loads(data)
-                print(f"[DEBUG] Parsed Redis result: {result}")
+                result = orjson.loads(data)
+                logger.debug("Parsed Redis result: %s", result)
                 return result
-            print(f"[DEBUG] No data found in Redis for key: {key}")
+            logger.debug("No data found in Redis for key: %s", key)
             return None
         except Exception as e:
-            print(f"[DEBUG] Redis get error: {e}")
+            logger.debug("Redis get error: %s", e)
             return None
 
     def set(self, user_id: str, session_data: Dict[str, Any]) -> None:
-        print(f"[DEBUG] RedisStore.set() called for user_id: {user_id}")
-        print(f"[DEBUG] Session data to save: {session_data}")
+        logger.debug("RedisStore.set() called for user_id: %s", user_id)
+        logger.debug("Session data to save: %s", session_data)
 
         if self.client is None:
-            print(f"[DEBUG] Using fallback store for saving")
+            logger.debug("Using fallback store for saving")
             self._fallback_store[user_id] = session_data
-            print(f"[DEBUG] Saved to fallback store")
+            logger.debug("Saved to fallback store")
             return
 
         key = self._get_key(user_id)
-        print(f"[DEBUG] Redis key for save: {key}")
+        logger.debug("Redis key for save: %s", key)
         try:
-            data = json.dumps(session_data)
-            print(f"[DEBUG] Serialized data: {data}")
+            data = _dumps(session_data)
+            logger.debug("Serialized data: %s", data)
             result = self.client.setex(key, self.ttl_seconds, data)
-            print(f"[DEBUG] Redis setex result: {result}")
+            logger.debug("Redis setex result: %s", result)
         except Exception as e:
-            print(f"[DEBUG] Redis set error: {e}")
+            logger.debug("Redis set error: %s", e)
             # Fallback to in-memory
             self._fallback_store[user_id] = session_data
-            print(f"[DEBUG] Fell back to in-memory store due to Redis error")
+            logger.debug("Fell back to in-memory store due to Redis error")
 
     def touch(self, user_id: str) -> None:
         if self.client is None:
@@ -98,11 +110,13 @@ class RedisSessionStore:
             return self._fallback_store.copy()
 
         sessions = {}
-        for key in self.client.scan_iter(f"{self.prefix}*"):
-            user_id = key.replace(self.prefix, "")
-            data = self.client.get(key)
-            if data:
-                sessions[user_id] = json.loads(data)
+        keys = list(self.client.scan_iter(f"{self.prefix}*", count=SCAN_BATCH_SIZE))
+        # Fetch session payloads in MGET batches instead of one GET per key
+        for start in range(0, len(keys), SCAN_BATCH_SIZE):
+            batch = keys[start:start + SCAN_BATCH_SIZE]
+            for key, data in zip(batch, self.client.mget(batch)):
+                if data:
+                    sessions[key[len(self.prefix):]] = orjson.loads(data)
         return sessions
 
     def cleanup_expired(self) -> int:
@@ -117,7 +131,7 @@ class RedisSessionStore:
 
         ttl = ttl or settings.REDIS_CACHE_TTL_SECONDS
         cache_key = f"flight:{search_key}"
-        data = json.dumps(results)
+        data = _dumps(results)
         self.client.setex(cache_key, ttl, data)
 
     def get_cached_search(self, search_key: str) -> Optional[Any]:
@@ -127,7 +141,7 @@ class RedisSessionStore:
         cache_key = f"flight:{search_key}"
         data = self.client.get(cache_key)
         if data:
-            return json.loads(data)
+            return orjson.loads(data)
         return None
 
     def create_search_key(self, origin: str, destination: str, dep_date: str,
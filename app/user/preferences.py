@@ -1,22 +1,85 @@
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from collections import Counter, defaultdict
+from operator import itemgetter
 import json
 
 
+# Per-user counters kept in their own Redis hashes and bumped with HINCRBY
+COUNTER_FIELDS = ("frequent_routes", "common_destinations")
+PROFILE_TTL_SECONDS = 86400 * 30  # 30 days
+
+
 class UserPreferenceManager:
     def __init__(self, redis_store):
         self.redis_store = redis_store
         self.prefix = "user_pref:"
 
     def get_user_profile(self, user_id: str) -> Dict:
-        key = f"{self.prefix}{user_id}"
-        profile = self.redis_store.client.get(key)
-        if profile:
-            return json.loads(profile)
+        profile, _ = self._load_profile(user_id)
+        return profile
 
-        # Initialize new profile
-        return self._create_default_profile(user_id)
+    def _counter_key(self, user_id: str, field: str) -> str:
+        return f"{self.prefix}{user_id}:{field}"
+
+    def _load_profile(self, user_id: str):
+        """Load profile JSON and counter hashes in one round-trip.
+
+        Returns the merged profile plus any counters still stored inside the
+        JSON blob by older versions, so the caller knows to move them to hashes.
+        """
+        pipe = self.redis_store.client.pipeline(transaction=False)
+        pipe.get(f"{self.prefix}{user_id}")
+        for field in COUNTER_FIELDS:
+            pipe.hgetall(self._counter_key(user_id, field))
+        raw, *counter_hashes = pipe.execute()
+
+        if not raw:
+            # Initialize new profile
+            return self._create_default_profile(user_id), {}
+
+        profile = json.loads(raw)
+        patterns = profile["travel_patterns"]
+        legacy_counters = {}
+        for field, stored in zip(COUNTER_FIELDS, counter_hashes):
+            counts = dict(patterns.get(field) or {})
+            if counts:
+                legacy_counters[field] = dict(counts)
+            for name, value in (stored or {}).items():
+                counts[name] = counts.get(name, 0) + int(value)
+            patterns[field] = counts
+        return profile, legacy_counters
+
+    def _move_legacy_counters(self, user_id: str) -> None:
+        """Move counters left in the profile JSON into their hashes atomically.
+
+        The blob is WATCHed, and its counters are cleared in the same MULTI as
+        the HINCRBYs, so overlapping searches cannot move the same counts twice.
+        """
+        profile_key = f"{self.prefix}{user_id}"
+
+        def move(pipe):
+            raw = pipe.get(profile_key)
+            if not raw:
+                return
+            profile = json.loads(raw)
+            patterns = profile["travel_patterns"]
+            legacy = {field: patterns.get(field) or {} for field in COUNTER_FIELDS}
+            if not any(legacy.values()):
+                # Already moved by a concurrent search
+                return
+
+            pipe.multi()
+            for field, counts in legacy.items():
+                counter_key = self._counter_key(user_id, field)
+                for name, amount in counts.items():
+                    pipe.hincrby(counter_key, name, amount)
+                pipe.expire(counter_key, PROFILE_TTL_SECONDS)
+                patterns[field] = {}
+            pipe.setex(profile_key, PROFILE_TTL_SECONDS, json.dumps(profile))
+
+        # redis-py retries the callable when the watched key changes mid-transaction
+        self.redis_store.client.transaction(move, profile_key)
 
     def _create_default_profile(self, user_id: str) -> Dict:
         return {
@@ -53,21 +116,27 @@ class UserPreferenceManager:
         }
 
     def update_from_search(self, user_id: str, search_params: Dict, selected_option: str = None):
-        profile = self.get_user_profile(user_id)
+        profile, legacy_counters = self._load_profile(user_id)
 
         # Update search count
         profile["insights"]["total_searches"] += 1
         profile["insights"]["last_active"] = datetime.now().isoformat()
 
         # Track route frequency
+        patterns = profile["travel_patterns"]
         route = f"{search_params['origin']}-{search_params['destination']}"
-        profile["travel_patterns"]["frequent_routes"][route] = \
-            profile["travel_patterns"]["frequent_routes"].get(route, 0) + 1
+        routes = patterns.setdefault("frequent_routes", {})
+        routes[route] = routes.get(route, 0) + 1
 
         # Track destinations
         dest = search_params["destination"]
-        profile["travel_patterns"]["common_destinations"][dest] = \
-            profile["travel_patterns"]["common_destinations"].get(dest, 0) + 1
+        destinations = patterns.setdefault("common_destinations", {})
+        destinations[dest] = destinations.get(dest, 0) + 1
+
+        # Counter deltas for Redis; legacy blob counters are moved over separately
+        if legacy_counters:
+            self._move_legacy_counters(user_id)
+        increments = {"frequent_routes": {route: 1}, "common_destinations": {dest: 1}}
 
         # Add to search history (keep last 20)
         search_record = {
@@ -86,7 +155,7 @@ class UserPreferenceManager:
         self._calculate_travel_patterns(profile)
 
         # Save updated profile
-        self._save_profile(user_id, profile)
+        self._save_profile(user_id, profile, increments)
         return profile
 
     def _infer_preferences(self, profile: Dict, selection: str):
@@ -105,38 +174,45 @@ class UserPreferenceManager:
         if len(searches) < 3:
             return
 
-        # Calculate average advance booking
+        # Single pass over recent searches: each date string is parsed once
         booking_advances = []
+        trip_lengths = []
         for search in searches[-10:]:  # Last 10 searches
-            if "departure_date" in search["params"]:
-                dep_date = datetime.fromisoformat(search["params"]["departure_date"])
-                search_date = datetime.fromisoformat(search["timestamp"])
-                advance = (dep_date - search_date).days
-                if advance > 0:
-                    booking_advances.append(advance)
+            params = search["params"]
+            if not params.get("departure_date"):
+                continue
+            dep = date.fromisoformat(params["departure_date"][:10])
+
+            search_date = datetime.fromisoformat(search["timestamp"])
+            advance = (datetime.combine(dep, time.min) - search_date).days
+            if advance > 0:
+                booking_advances.append(advance)
+
+            if params.get("return_date"):
+                ret = date.fromisoformat(params["return_date"][:10])
+                trip_lengths.append((ret - dep).days)
 
+        # Calculate average advance booking
         if booking_advances:
             profile["travel_patterns"]["advance_booking_days"] = sum(booking_advances) // len(booking_advances)
 
         # Calculate typical trip length
-        trip_lengths = []
-        for search in searches[-10:]:
-            params = search["params"]
-            if params.get("departure_date") and params.get("return_date"):
-                dep = datetime.fromisoformat(params["departure_date"])
-                ret = datetime.fromisoformat(params["return_date"])
-                trip_lengths.append((ret - dep).days)
-
         if trip_lengths:
             profile["travel_patterns"]["typical_trip_length"] = sum(trip_lengths) // len(trip_lengths)
 
-    def _save_profile(self, user_id: str, profile: Dict):
-        key = f"{self.prefix}{user_id}"
-        self.redis_store.client.setex(
-            key,
-            86400 * 30,  # 30 days TTL
-            json.dumps(profile)
-        )
+    def _save_profile(self, user_id: str, profile: Dict, increments: Dict[str, Dict[str, int]] = None):
+        """Save profile JSON without the counters, which are bumped in their hashes"""
+        patterns = profile["travel_patterns"]
+        blob = {**profile, "travel_patterns": {**patterns, **{field: {} for field in COUNTER_FIELDS}}}
+
+        pipe = self.redis_store.client.pipeline()
+        pipe.setex(f"{self.prefix}{user_id}", PROFILE_TTL_SECONDS, json.dumps(blob))
+        for field in COUNTER_FIELDS:
+            counter_key = self._counter_key(user_id, field)
+            for name, amount in (increments or {}).get(field, {}).items():
+                pipe.hincrby(counter_key, name, amount)
+            pipe.expire(counter_key, PROFILE_TTL_SECONDS)
+        pipe.execute()
 
     def get_personalized_suggestions(self, user_id: str, current_search: Dict = None) -> List[str]:
         profile = self.get_user_profile(user_id)
@@ -144,7 +220,7 @@ class UserPreferenceManager:
 
         # Suggest based on frequent routes
         if profile["travel_patterns"]["frequent_routes"]:
-            top_route = max(profile["travel_patterns"]["frequent_routes"].items(), key=lambda x: x[1])[0]
+            top_route = max(profile["travel_patterns"]["frequent_routes"].items(), key=itemgetter(1))[0]
             origin, dest = top_route.split("-")
             suggestions.append(f"Search your usual {origin} to {dest} route")
 
@@ -172,14 +248,15 @@ class UserPreferenceManager:
 
         return suggestions[:3]  # Return top 3 suggestions
 
-    def get_quick_actions(self, user_id: str) -> List[Dict]:
-        profile = self.get_user_profile(user_id)
+    def get_quick_actions(self, user_id: str, profile: Dict = None) -> List[Dict]:
+        if profile is None:
+            profile = self.get_user_profile(user_id)
         actions = []
 
         # Most frequent route
         if profile["travel_patterns"]["frequent_routes"]:
             top_routes = sorted(profile["travel_patterns"]["frequent_routes"].items(),
-                              key=lambda x: x[1], reverse=True)[:3]
+                              key=itemgetter(1), reverse=True)[:3]
             for route, count in top_routes:
                 origin, dest = route.split("-")
                 actions.append({
@@ -207,8 +284,9 @@ class UserPreferenceManager:
 
         return actions[:5]
 
-    def should_offer_help(self, user_id: str) -> bool:
-        profile = self.get_user_profile(user_id)
+    def should_offer_help(self, user_id: str, profile: Dict = None) -> bool:
+        if profile is None:
+            profile = self.get_user_profile(user_id)
 
         # New user
         if profile["insights"]["total_searches"] == 0:
@@ -222,8 +300,9 @@ class UserPreferenceManager:
 
         return False
 
-    def format_welcome_back(self, user_id: str) -> str:
-        profile = self.get_user_profile(user_id)
+    def format_welcome_back(self, user_id: str, profile: Dict = None) -> str:
+        if profile is None:
+            profile = self.get_user_profile(user_id)
 
         if profile["insights"]["total_searches"] == 0:
             return "Welcome! I'm here to help you find the perfect flight. Just tell me where you want to go!"
@@ -232,15 +311,22 @@ class UserPreferenceManager:
         messages = []
 
         if profile["travel_patterns"]["frequent_routes"]:
-            top_route = max(profile["travel_patterns"]["frequent_routes"].items(), key=lambda x: x[1])[0]
+            top_route = max(profile["travel_patterns"]["frequent_routes"].items(), key=itemgetter(1))[0]
             messages.append(f"Welcome back! Looking for {top_route} flights again?")
         else:
             messages.append("Welcome back! Where are we flying today?")
 
         # Add quick actions
-        quick_actions = self.get_quick_actions(user_id)
+        quick_actions = self.get_quick_actions(user_id, profile)
         if quick_actions:
             action_text = " | ".join([a["command"] for a in quick_actions[:2]])
             messages.append(f"Quick actions: {action_text}")
 
-        return "\n".join(messages)
\ No newline at end of file
+        return "\n".join(messages)
+
+    def get_welcome_message(self, user_id: str) -> Optional[str]:
+        """Welcome text if the user should be offered help, loading the profile once"""
+        profile = self.get_user_profile(user_id)
+        if not self.should_offer_help(user_id, profile):
+            return None
+        return self.format_welcome_back(user_id, profile)
@@ -2,6 +2,7 @@ import dateparser
 from datetime import datetime, timedelta
 import pytz
 import re
+from functools import lru_cache
 
 def get_current_datetime(tz: str = "UTC") -> datetime:
     """Get current datetime with timezone (inspired by elysia approach)"""
@@ -74,14 +75,15 @@ def to_iso_date(text: str, tz: str = "UTC") -> str:
     return ""
 
 
+@lru_cache(maxsize=512)
 def format_duration_minutes(total_minutes: int) -> str:
     """
     Convert duration in minutes to a compact human string, e.g. 85 -> "1h 25min".
+    Memoized: flight durations cluster around a few hundred values.
     """
     if total_minutes is None or total_minutes < 0:
         return ""
-    h = total_minutes // 60
-    m = total_minutes % 60
+    h, m = divmod(total_minutes, 60)
     if h and m:
         return f"{h}h {m}min"
     if h:
@@ -4,7 +4,6 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Form, Request, BackgroundTasks, HTTPException
 from fastapi.responses import PlainTextResponse, Response, JSONResponse
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 
 from app.config import settings
 from app.iata.lookup import IATADb
@@ -24,6 +23,8 @@ from app.infrastructure.resilience import (
 )
 from app.obs.middleware import ObservabilityMiddleware
 from app.obs.logger import log_event
+from app.obs.metrics import get_metrics_snapshot
+from app.utils.twilio import to_twiml_message
 
 load_dotenv()
 
@@ -37,6 +38,8 @@ async def lifespan(app: FastAPI):
     app.state.redis_store = RedisSessionStore()
     app.state.amadeus = AmadeusClient()
     app.state.iata = IATADb(csv_path="data/iata/iata_codes_19_sep.csv")
+    # Imported here so importing the app (tests, admin tooling) skips the OpenAI client stack
+    from langchain_openai import ChatOpenAI
     app.state.llm = ChatOpenAI(
         model=settings.OPENAI_MODEL,
         temperature=0,
@@ -142,7 +145,6 @@ async def detailed_health(request: Request):
 
 @app.get("/metrics")
 async def metrics(request: Request):
-    from app.obs.metrics import get_metrics_snapshot
     # Guard against missing state when app is wrapped by middleware in tests
     cache_stats = getattr(request.app.state, "cache_manager", None)
     cache_stats = cache_stats.get_cache_stats() if cache_stats else {"hits": 0, "misses": 0, "hit_rate": "0.0%", "popular_routes": 0}
@@ -188,14 +190,12 @@ async def whatsapp_webhook(
     )
 
     # Check if user needs welcome message
-    user_prefs = request.app.state.user_prefs
-    if user_prefs.should_offer_help(phone_number):
-        welcome = user_prefs.format_welcome_back(phone_number)
-        # Could send welcome via background task
+    welcome = request.app.state.user_prefs.get_welcome_message(phone_number)
+    # Could send welcome via background task
 
     # Process message with LangGraph handler
     try:
-        response = request.app.state.conversation.handle_message(
+        response = await request.app.state.conversation.ahandle_message(
             user_id=phone_number,
             message=message
         )
@@ -205,7 +205,6 @@ async def whatsapp_webhook(
         response = request.app.state.formatter.format_error_friendly("general")
 
     # Convert to TwiML
-    from app.utils.twilio import to_twiml_message
     xml = to_twiml_message(response)
 
     # Twilio accepts both application/xml and text/xml; prefer text/xml per docs
@@ -266,8 +265,7 @@ async def langgraph_metrics(request: Request):
 async def reset_circuit_breaker(request: Request, name: str):
     """Admin endpoint to manually reset a circuit breaker"""
     if name == "amadeus_api":
-        request.app.state.amadeus_breaker.state = CircuitBreaker.CircuitState.CLOSED
-        request.app.state.amadeus_breaker.failure_count = 0
+        request.app.state.amadeus_breaker.reset()
         return {"status": "reset", "breaker": name}
     return {"error": "Unknown circuit breaker"}
 
@@ -62,6 +62,23 @@ class TestBasicIntegration:
             print(f"❌ Handler failed: {e}")
             raise
 
+    async def test_async_message_processing(self):
+        """Test async entry point returns the same kind of response"""
+        session_store = Mock()
+        session_store.get.return_value = None
+
+        handler = LangGraphHandler(
+            session_store=session_store,
+            llm=Mock(),
+            amadeus_client=Mock(),
+            cache_manager=Mock()
+        )
+
+        response = await handler.ahandle_message("test_user", "Hello")
+        assert isinstance(response, str)
+        assert len(response) > 0
+        session_store.set.assert_called()
+
     def test_session_info_methods(self):
         """Test session info methods work"""
         session_store = Mock()
@@ -1,6 +1,6 @@
 import pytest
 import json
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import ANY, Mock, MagicMock, patch
 from datetime import datetime, timedelta
 from app.cache.flight_cache import FlightCacheManager
 from app.user.preferences import UserPreferenceManager
@@ -73,6 +73,45 @@ class TestFlightCacheManager:
         }
         assert cache_manager._is_cache_fresh(stale_data, max_age_minutes=60) == False
 
+    def test_get_cached_results_unwraps_envelope(self, cache_manager, mock_redis_store):
+        mock_redis_store.get_cached_search.return_value = {
+            "results": [{"price": 500}],
+            "cached_at": datetime.now().isoformat()
+        }
+        assert cache_manager.get_cached_results("key1") == [{"price": 500}]
+
+        # Stale entries are treated as misses
+        mock_redis_store.get_cached_search.return_value = {
+            "results": [{"price": 500}],
+            "cached_at": (datetime.now() - timedelta(hours=2)).isoformat()
+        }
+        assert cache_manager.get_cached_results("key1") is None
+
+        stats = cache_manager.get_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_get_cached_results_serves_stale_and_notifies(self, cache_manager, mock_redis_store):
+        on_stale = Mock()
+        mock_redis_store.get_cached_search.return_value = {
+            "results": [{"price": 500}],
+            "cached_at": (datetime.now() - timedelta(minutes=45)).isoformat()
+        }
+        results = cache_manager.get_cached_results(
+            "key1", max_age_minutes=60, stale_after_minutes=30, on_stale=on_stale
+        )
+        assert results == [{"price": 500}]
+        on_stale.assert_called_once_with()
+
+        # Fresh entries do not trigger a refresh
+        on_stale.reset_mock()
+        mock_redis_store.get_cached_search.return_value = {
+            "results": [{"price": 500}],
+            "cached_at": datetime.now().isoformat()
+        }
+        cache_manager.get_cached_results("key1", max_age_minutes=60, stale_after_minutes=30, on_stale=on_stale)
+        on_stale.assert_not_called()
+
     def test_popular_routes(self, cache_manager):
         routes = cache_manager._get_popular_routes()
         assert len(routes) > 0
@@ -111,6 +150,7 @@ class TestUserPreferenceManager:
         store.client = Mock()
         store.client.get.return_value = None
         store.client.setex.return_value = None
+        store.client.pipeline.return_value.execute.return_value = [None, {}, {}]
         return store
 
     @pytest.fixture
@@ -140,6 +180,53 @@ class TestUserPreferenceManager:
         assert profile["preferences"]["budget_conscious"] == True
         assert profile["insights"]["price_sensitivity"] == "high"
 
+    def test_update_from_search_increments_counter_hashes(self, pref_manager, mock_redis_store):
+        pipe = mock_redis_store.client.pipeline.return_value
+        stored = pref_manager._create_default_profile("user123")
+        stored["travel_patterns"]["frequent_routes"] = {"NYC-PAR": 2}  # legacy blob counters
+        pipe.execute.return_value = [json.dumps(stored), {"NYC-LON": "3"}, {"LON": "3"}]
+
+        profile = pref_manager.update_from_search("user123", {"origin": "NYC", "destination": "LON"})
+
+        assert profile["travel_patterns"]["frequent_routes"] == {"NYC-PAR": 2, "NYC-LON": 4}
+        assert profile["travel_patterns"]["common_destinations"] == {"LON": 4}
+        pipe.hincrby.assert_any_call("user_pref:user123:frequent_routes", "NYC-LON", 1)
+        pipe.hincrby.assert_any_call("user_pref:user123:common_destinations", "LON", 1)
+        assert pipe.hincrby.call_count == 2
+
+        # Legacy counters go through the atomic move, not the save pipeline
+        mock_redis_store.client.transaction.assert_called_once()
+
+        # Counters are no longer written inside the profile JSON
+        saved = json.loads(pipe.setex.call_args[0][2])
+        assert saved["travel_patterns"]["frequent_routes"] == {}
+
+    def test_move_legacy_counters_runs_once(self, pref_manager, mock_redis_store):
+        stored = pref_manager._create_default_profile("user123")
+        stored["travel_patterns"]["frequent_routes"] = {"NYC-PAR": 2}
+        stored["travel_patterns"]["common_destinations"] = {"PAR": 2}
+        tx = Mock()
+        tx.get.return_value = json.dumps(stored)
+        mock_redis_store.client.transaction.side_effect = lambda func, *keys: func(tx)
+
+        pref_manager._move_legacy_counters("user123")
+
+        mock_redis_store.client.transaction.assert_called_once_with(ANY, "user_pref:user123")
+        tx.multi.assert_called_once()
+        tx.hincrby.assert_any_call("user_pref:user123:frequent_routes", "NYC-PAR", 2)
+        tx.hincrby.assert_any_call("user_pref:user123:common_destinations", "PAR", 2)
+        cleared = json.loads(tx.setex.call_args[0][2])
+        assert cleared["travel_patterns"]["frequent_routes"] == {}
+        assert cleared["travel_patterns"]["common_destinations"] == {}
+
+        # A search that loaded the same legacy blob finds the counters already moved
+        tx.reset_mock()
+        tx.get.return_value = json.dumps(cleared)
+        pref_manager._move_legacy_counters("user123")
+
+        tx.multi.assert_not_called()
+        tx.hincrby.assert_not_called()
+
     def test_infer_preferences_from_selection(self, pref_manager):
         profile = pref_manager._create_default_profile("user123")
 
@@ -217,4 +304,34 @@ class TestUserPreferenceManager:
         profile_inactive["insights"]["total_searches"] = 10
         profile_inactive["insights"]["last_active"] = (datetime.now() - timedelta(days=45)).isoformat()
         with patch.object(pref_manager, 'get_user_profile', return_value=profile_inactive):
-            assert pref_manager.should_offer_help("inactive_user") == True
\ No newline at end of file
+            assert pref_manager.should_offer_help("inactive_user") == True
+
+    def test_welcome_message_loads_profile_once(self, pref_manager):
+        profile = pref_manager._create_default_profile("user123")
+        profile["insights"]["total_searches"] = 4
+        profile["insights"]["last_active"] = (datetime.now() - timedelta(days=45)).isoformat()
+        profile["travel_patterns"]["frequent_routes"] = {"NYC-LON": 4}
+        profile["history"]["searches"] = [{"params": {"origin": "NYC", "destination": "LON"}}]
+
+        with patch.object(pref_manager, 'get_user_profile', return_value=profile) as mock_get:
+            welcome = pref_manager.get_welcome_message("user123")
+
+        assert mock_get.call_count == 1
+        assert "Welcome back!" in welcome
+        assert "search NYC to LON" in welcome
+
+
+class TestRedisSessionStore:
+    def test_get_all_sessions_batches_reads(self):
+        client = MagicMock()
+        client.scan_iter.return_value = ["session:alice", "session:bob"]
+        client.mget.return_value = [json.dumps({"info": {"origin": "NYC"}}), None]
+
+        with patch("app.session.redis_store.redis.from_url", return_value=client):
+            store = RedisSessionStore(redis_url="redis://localhost:6379/0", ttl_seconds=60)
+
+        sessions = store.get_all_sessions()
+
+        assert sessions == {"alice": {"info": {"origin": "NYC"}}}
+        client.mget.assert_called_once_with(["session:alice", "session:bob"])
+        client.get.assert_not_called()
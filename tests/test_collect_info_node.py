@@ -17,6 +17,7 @@ from app.langgraph.state import (
 from app.langgraph.nodes.collect_info import CollectInfoNode, collect_info_node
 from app.langgraph.tools.extractor import ExtractionResult
 from app.langgraph.tools.conversation_manager import ConversationAction
+from app.utils.dates import to_iso_date
 
 
 class TestCollectInfoNode:
@@ -35,6 +36,87 @@ class TestCollectInfoNode:
         node = CollectInfoNode(mock_llm)
         assert node.llm == mock_llm
 
+    def test_llm_skipped_when_fast_parse_complete(self):
+        """Test LLM extraction is skipped when nothing is left to extract"""
+        node = CollectInfoNode(Mock(spec=ChatOpenAI))
+        state = create_initial_state()
+
+        with patch.object(node.extractor, "_try_llm_extraction") as mock_llm_extraction:
+            node.extractor._run("from NYC to LON on December 15", state)
+            node.extractor._run("yes", state)
+            mock_llm_extraction.assert_not_called()
+
+            node.extractor._run("somewhere warm please", state)
+            mock_llm_extraction.assert_called_once()
+
+    def test_llm_runs_for_edits_to_complete_trip(self):
+        """Test a complete trip only skips the LLM for confirmations, not free-text edits"""
+        node = CollectInfoNode(Mock(spec=ChatOpenAI))
+        state = create_initial_state()
+        state = add_extracted_info(state, {
+            "origin": "NYC",
+            "destination": "LON",
+            "departure_date": "2025-12-15"
+        })
+
+        llm_fields = {"method": "llm", "confidence": 0.8, "fields": {"destination": "ROM"}}
+
+        with patch.object(node.extractor, "_try_llm_extraction", return_value=llm_fields) as mock_llm_extraction:
+            node.extractor._run("looks good", state)
+            mock_llm_extraction.assert_not_called()
+
+            result = node.extractor._run("actually make it Rome", state)
+            mock_llm_extraction.assert_called_once()
+            assert result.extracted_fields["destination"] == "ROM"
+
+    def test_llm_skipped_for_simple_replies(self):
+        """Test short replies like '2 adults' never reach the LLM"""
+        from app.obs.metrics import get_metrics_snapshot
+
+        def skipped_count():
+            return sum(c["value"] for c in get_metrics_snapshot()["counters"]
+                       if c["name"] == "llm_extraction_skipped" and c["labels"] == {"reason": "simple_reply"})
+
+        node = CollectInfoNode(Mock(spec=ChatOpenAI))
+        state = create_initial_state()
+        before = skipped_count()
+
+        with patch.object(node.extractor, "_try_llm_extraction") as mock_llm_extraction:
+            passengers = node.extractor._run("2 adults", state)
+            departure = node.extractor._run("tomorrow", state)
+            mock_llm_extraction.assert_not_called()
+
+        assert skipped_count() == before + 2
+        assert passengers.extracted_fields == {"passengers": 2}
+        assert departure.extracted_fields["departure_date"] == to_iso_date("tomorrow")
+
+    def test_llm_extraction_cached_for_repeated_messages(self):
+        """Test repeated short messages reuse the cached LLM result"""
+        node = CollectInfoNode(Mock(spec=ChatOpenAI))
+        state = create_initial_state()
+
+        with patch.object(node.extractor, "_call_llm_extraction", return_value=None) as mock_call:
+            node.extractor._try_llm_extraction("Somewhere warm", state)
+            node.extractor._try_llm_extraction("  somewhere   WARM ", state)
+            assert mock_call.call_count == 1
+
+            node.extractor._try_llm_extraction("somewhere cold", state)
+            assert mock_call.call_count == 2
+
+    def test_llm_extraction_cache_keyed_on_state(self):
+        """Test a cached LLM result is not reused for a conversation in a different state"""
+        node = CollectInfoNode(Mock(spec=ChatOpenAI))
+        state = create_initial_state()
+        other_state = add_extracted_info(state, {"departure_date": "2025-12-12"})
+
+        with patch.object(node.extractor, "_call_llm_extraction", return_value=None) as mock_call:
+            node.extractor._try_llm_extraction("change it to friday", state)
+            node.extractor._try_llm_extraction("change it to friday", other_state)
+            assert mock_call.call_count == 2
+
+            node.extractor._try_llm_extraction("change it to friday", other_state)
+            assert mock_call.call_count == 2
+
     def test_greeting_handling(self):
         """Test handling of greeting messages"""
         node = CollectInfoNode()
@@ -96,6 +178,22 @@ class TestCollectInfoNode:
         assert result2["destination"] == "Tokyo"  # Should preserve previous info
         assert "departure_date" in result2["missing_fields"]
 
+    def test_single_city_reply_uses_bot_question_context(self):
+        """Test a bare city name fills the field the bot just asked about"""
+        node = CollectInfoNode()
+
+        state = create_initial_state()
+        state = update_conversation(state, "Hi", "Great! Where are you flying from?")
+        state["user_message"] = "Paris"
+        result = node.extractor._run("Paris", state)
+        assert result.extracted_fields.get("origin") == "PARIS"
+
+        state = create_initial_state()
+        state["origin"] = "NYC"
+        state = update_conversation(state, "From NYC", "What's your destination?")
+        result = node.extractor._run("Paris", state)
+        assert result.extracted_fields.get("destination") == "PARIS"
+
     def test_correction_handling(self):
         """Test handling corrections to previously extracted information"""
         node = CollectInfoNode()
@@ -38,3 +38,21 @@ def test_country_alias_holland():
     codes = db.resolve("Holland")
     # Expect Netherlands codes like AMS
     assert any(c in codes for c in ("AMS",))
+
+
+
+def test_partial_match_substring():
+    db = IATADb(csv_path="data/iata/iata_codes_19_sep.csv")
+    # Mid-word fragments go through the trigram index
+    codes = db.resolve("ondo")
+    assert any(c in codes for c in ("LHR", "LGW", "LCY"))
+    assert len(codes) <= 5
+    assert db.resolve("qqzz") == []
+
+
+def test_resolve_cached_per_instance():
+    db = IATADb(csv_path="data/iata/iata_codes_19_sep.csv")
+    first = db.resolve("London")
+    first.append("XXX")  # callers get their own list
+    assert db.resolve(" london ") == first[:-1]
+    assert db._resolve_cached.cache_info().hits == 1
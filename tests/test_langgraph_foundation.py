@@ -8,9 +8,11 @@ import pytest
 from typing import Dict, Any
 from app.langgraph.state import (
     TravelState,
+    MAX_CONVERSATION_TURNS,
     create_initial_state,
     add_extracted_info,
     add_field_confidence,
+    add_field_confidences,
     set_trip_type,
     increment_clarification_attempts,
     set_validation_status,
@@ -19,6 +21,7 @@ from app.langgraph.state import (
     set_missing_fields,
     set_search_results,
     get_required_fields,
+    get_missing_fields,
     has_required_fields,
     has_trip_type_decision,
     is_complete_for_api,
@@ -116,6 +119,15 @@ class TestStateReducers:
 
         assert new_state["field_confidence"]["origin"] == 0.95
 
+    def test_add_field_confidences(self):
+        """Test adding several confidence scores at once"""
+        state = add_field_confidence(create_initial_state(), "origin", 0.5)
+        new_state = add_field_confidences(state, {"origin": 0.95, "destination": 0.9})
+
+        assert new_state["field_confidence"] == {"origin": 0.95, "destination": 0.9}
+        # Original state should be unchanged
+        assert state["field_confidence"] == {"origin": 0.5}
+
     def test_set_trip_type(self):
         """Test setting trip type"""
         state = create_initial_state()
@@ -183,6 +195,30 @@ class TestStateReducers:
         assert state2["conversation_history"][1]["user"] == "NYC to London"
         assert state2["conversation_history"][1]["bot"] == "Great choice!"
 
+    def test_update_conversation_caps_history(self):
+        """Test conversation history keeps only the most recent turns"""
+        state = create_initial_state()
+        for i in range(MAX_CONVERSATION_TURNS + 5):
+            state = update_conversation(state, f"user {i}", f"bot {i}")
+
+        history = state["conversation_history"]
+        assert len(history) == MAX_CONVERSATION_TURNS
+        assert history[-1]["user"] == f"user {MAX_CONVERSATION_TURNS + 4}"
+        assert history[0]["user"] == "user 5"
+
+    def test_reducers_do_not_mutate_previous_state(self):
+        """Test reducers replace containers instead of mutating shared ones"""
+        state = update_conversation(create_initial_state(), "Hello", "Hi there!")
+        state = add_field_confidence(state, "origin", 0.9)
+
+        later = add_field_confidences(state, {"destination": 0.8})
+        later = update_conversation(later, "NYC to London", "Great choice!")
+
+        assert state["field_confidence"] == {"origin": 0.9}
+        assert len(state["conversation_history"]) == 1
+        assert later["field_confidence"] == {"origin": 0.9, "destination": 0.8}
+        assert len(later["conversation_history"]) == 2
+
     def test_set_search_results(self):
         """Test setting search results"""
         state = create_initial_state()
@@ -219,6 +255,17 @@ class TestStateAnalysis:
         })
         assert has_required_fields(state) is True
 
+    def test_get_missing_fields(self):
+        """Test missing required fields are reported in collection order"""
+        state = create_initial_state()
+        assert get_missing_fields(state) == ["origin", "destination", "departure_date"]
+
+        state = add_extracted_info(state, {"destination": "LON"})
+        assert get_missing_fields(state) == ["origin", "departure_date"]
+
+        state = add_extracted_info(state, {"origin": "NYC", "departure_date": "2025-01-15"})
+        assert get_missing_fields(state) == []
+
     def test_has_trip_type_decision(self):
         """Test checking trip type decision"""
         state = create_initial_state()
@@ -305,6 +352,14 @@ class TestStateGraph:
         compiled_graph = compile_travel_graph()
         assert compiled_graph is not None
 
+    def test_compiled_graph_reused_for_same_dependencies(self):
+        """Test compiled graphs are shared per dependency set"""
+        llm, client = object(), object()
+        graph = compile_travel_graph(llm=llm, amadeus_client=client)
+
+        assert compile_travel_graph(llm=llm, amadeus_client=client) is graph
+        assert compile_travel_graph(llm=object(), amadeus_client=client) is not graph
+
     def test_start_conversation(self):
         """Test starting a new conversation"""
         message = "I need a flight to London"
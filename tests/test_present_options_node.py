@@ -359,6 +359,21 @@ class TestPresentOptionsNode:
         assert ("returning December 22" in summary.lower() or
                 "December 22" in summary)
 
+    def test_round_trip_summary_without_departure_date(self):
+        """Test return date still formats when departure date is missing"""
+        state = create_initial_state()
+        state = add_extracted_info(state, {
+            "origin": "NYC",
+            "destination": "London",
+            "return_date": "2025-12-22"
+        })
+        state = set_trip_type(state, "round_trip", True)
+
+        node = PresentOptionsNode()
+        summary = node._get_trip_summary(state)
+
+        assert summary == "NYC → London (returning December 22)"
+
     def test_state_preservation(self, complete_state_with_results):
         """Test that original state is preserved during presentation"""
         original_search_results = complete_state_with_results["search_results"]
@@ -0,0 +1,161 @@
+import pytest
+from unittest.mock import Mock, patch
+
+from app.infrastructure.resilience import (
+    CircuitBreaker, CircuitState, HealthChecker, RateLimiter, RetryPolicy
+)
+
+
+def test_local_rate_limit_allows_burst_then_blocks():
+    limiter = RateLimiter()
+    with patch("app.infrastructure.resilience.time.monotonic", return_value=1000.0):
+        results = [limiter.check_rate_limit("ip:1", max_requests=150, window_seconds=60)[0] for _ in range(151)]
+        allowed, info = limiter.check_rate_limit("ip:1", max_requests=150, window_seconds=60)
+
+    # Limits above 100 are honoured (no fixed-size history)
+    assert results[:150] == [True] * 150
+    assert results[150] is False
+    assert allowed is False
+    assert info["current"] == 150
+    assert info["retry_after"] == 1
+
+
+def test_local_rate_limit_refills_over_window():
+    limiter = RateLimiter()
+    with patch("app.infrastructure.resilience.time.monotonic", return_value=1000.0):
+        for _ in range(2):
+            limiter.check_rate_limit("ip:1", max_requests=2, window_seconds=60)
+        assert limiter.check_rate_limit("ip:1", max_requests=2, window_seconds=60)[0] is False
+
+    # Half a window refills one token
+    with patch("app.infrastructure.resilience.time.monotonic", return_value=1030.0):
+        assert limiter.check_rate_limit("ip:1", max_requests=2, window_seconds=60)[0] is True
+        assert limiter.check_rate_limit("ip:1", max_requests=2, window_seconds=60)[0] is False
+
+    # Other keys are independent
+    assert limiter.check_rate_limit("ip:2", max_requests=2, window_seconds=60)[0] is True
+
+
+def test_local_rate_limit_sweeps_idle_keys():
+    with patch("app.infrastructure.resilience.time.monotonic", return_value=1000.0):
+        limiter = RateLimiter()
+        limiter.check_rate_limit("ip:old", max_requests=5, window_seconds=60)
+
+    with patch("app.infrastructure.resilience.time.monotonic", return_value=1050.0):
+        limiter.check_rate_limit("ip:recent", max_requests=5, window_seconds=60)
+
+    # Too soon for a sweep
+    with patch("app.infrastructure.resilience.time.monotonic", return_value=1055.0):
+        limiter.check_rate_limit("ip:new", max_requests=5, window_seconds=60)
+    assert "ip:old" in limiter.local_cache
+
+    # Past the sweep interval, only keys idle for ten windows are dropped
+    with patch("app.infrastructure.resilience.time.monotonic", return_value=1620.0):
+        limiter.check_rate_limit("ip:new", max_requests=5, window_seconds=60)
+    assert set(limiter.local_cache) == {"ip:recent", "ip:new"}
+
+
+def test_redis_rate_limit_uses_single_script_call():
+    client = Mock()
+    script = client.register_script.return_value
+    script.return_value = [1, 3]
+    limiter = RateLimiter(client)
+
+    allowed, info = limiter.check_rate_limit("ip:1", max_requests=60, window_seconds=60)
+
+    assert allowed is True
+    assert info["current"] == 3
+    script.assert_called_once()
+    assert script.call_args.kwargs["keys"] == ["rate_limit:ip:1"]
+    client.pipeline.assert_not_called()
+
+    script.return_value = [0, 60]
+    allowed, info = limiter.check_rate_limit("ip:1", max_requests=60, window_seconds=60)
+    assert allowed is False
+    assert info["retry_after"] == 60
+
+
+async def test_health_checks_run_only_when_due():
+    checker = HealthChecker()
+    calls = []
+
+    def check_db():
+        calls.append(1)
+        return len(calls) < 2  # healthy first, then failing
+
+    checker.register_check("db", check_db, interval_seconds=30)
+
+    with patch("app.infrastructure.resilience.time.monotonic", return_value=100.0):
+        first = await checker.run_checks()
+        second = await checker.run_checks()
+
+    assert len(calls) == 1
+    assert first["status"] == second["status"] == "healthy"
+
+    # Once the interval elapses the check runs again and the status flips
+    with patch("app.infrastructure.resilience.time.monotonic", return_value=131.0):
+        third = await checker.run_checks()
+
+    assert len(calls) == 2
+    assert third["status"] == "unhealthy"
+    assert third["checks"]["db"]["status"] == "unhealthy"
+
+
+async def test_retry_policy_jittered_backoff_and_deadline():
+    policy = RetryPolicy(max_attempts=3, backoff_base=2.0, max_delay=60)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ValueError("boom")
+        return "ok"
+
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    with patch("app.infrastructure.resilience.asyncio.sleep", fake_sleep), \
+         patch("app.infrastructure.resilience.random.random", return_value=0.0):
+        assert await policy.execute_with_retry(flaky) == "ok"
+
+    # Base delays 1s and 2s scaled by the jitter factor (0.5 at random() == 0)
+    assert sleeps == [0.5, 1.0]
+
+    # A backoff that would overrun the time budget is not slept through
+    bounded = RetryPolicy(max_attempts=3, backoff_base=2.0, max_total_seconds=0.1)
+
+    def always_fails():
+        raise ValueError("down")
+
+    with patch("app.infrastructure.resilience.asyncio.sleep", fake_sleep):
+        with pytest.raises(ValueError):
+            await bounded.execute_with_retry(always_fails)
+    assert len(sleeps) == 2
+
+
+def test_circuit_breaker_allows_single_half_open_probe():
+    breaker = CircuitBreaker("api", failure_threshold=2, recovery_timeout=60)
+
+    def fail():
+        raise RuntimeError("down")
+
+    with patch("app.infrastructure.resilience.time.monotonic", return_value=100.0):
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                breaker.call(fail)
+        assert breaker.state is CircuitState.OPEN
+        with pytest.raises(Exception, match="is OPEN"):
+            breaker.call(lambda: "ok")
+
+    # After the recovery timeout only the first caller gets through
+    with patch("app.infrastructure.resilience.time.monotonic", return_value=161.0):
+        breaker._before_call()
+        assert breaker.state is CircuitState.HALF_OPEN
+        with pytest.raises(Exception, match="HALF_OPEN"):
+            breaker.call(lambda: "ok")
+
+        breaker._on_success()
+        assert breaker.state is CircuitState.CLOSED
+        assert breaker.call(lambda: "ok") == "ok"
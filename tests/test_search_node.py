@@ -5,6 +5,11 @@ Tests flight search functionality, validation gates, cache integration,
 and error handling scenarios.
 """
 
+import threading
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from typing import Dict, Any
@@ -18,7 +23,9 @@ from app.langgraph.state import (
     set_search_results
 )
 from app.langgraph.nodes.search_flights import SearchFlightsNode
-from app.langgraph.tools.amadeus_search import AmadeusSearchTool, SearchParams, SearchResult
+from app.langgraph.tools.amadeus_search import (
+    AmadeusSearchTool, SearchParams, SearchResult, _cache_fresh_seconds
+)
 
 
 class TestAmadeusSearchTool:
@@ -88,6 +95,78 @@ class TestAmadeusSearchTool:
             adults=2
         )
 
+    def test_concurrent_identical_searches_share_one_request(self, mock_amadeus_client, mock_cache_manager, validated_state):
+        """Test identical searches in flight at once make a single API call"""
+        joined = threading.Event()
+        results = {"data": [{"id": "shared"}]}
+
+        class JoinAwareFuture(Future):
+            def result(self, timeout=None):
+                joined.set()
+                return super().result(timeout)
+
+        def slow_search(**kwargs):
+            # Hold the request open until the second caller is waiting on it
+            joined.wait(timeout=5)
+            return results
+
+        mock_amadeus_client.search_flights.side_effect = slow_search
+        tool = AmadeusSearchTool(mock_amadeus_client, mock_cache_manager)
+
+        with patch("app.langgraph.tools.amadeus_search.Future", JoinAwareFuture), \
+                ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(tool.search, validated_state)
+            while not tool._inflight:
+                time.sleep(0.001)
+            second = pool.submit(tool.search, validated_state)
+            outcomes = [first.result(timeout=5), second.result(timeout=5)]
+
+        assert [r.results for r in outcomes] == [results, results]
+        assert all(r.success and r.cache_key == "NYC|LON|2025-01-15|ONEWAY|2" for r in outcomes)
+        mock_amadeus_client.search_flights.assert_called_once()
+        mock_cache_manager.cache_results.assert_called_once()
+        assert tool._inflight == {}
+
+    def test_cache_freshness_scales_with_time_to_departure(self):
+        """Test cached fares stay fresh longer for distant departures, within bounds"""
+        today = datetime.now().date()
+        assert _cache_fresh_seconds((today + timedelta(days=60)).isoformat()) == 30 * 60
+        assert _cache_fresh_seconds((today - timedelta(days=1)).isoformat()) == 60
+        assert _cache_fresh_seconds("not a date") == 30 * 60
+
+        departure_midnight = datetime.combine(today + timedelta(days=1), datetime.min.time())
+        with patch("app.langgraph.tools.amadeus_search.datetime") as mock_datetime:
+            mock_datetime.combine = datetime.combine
+            mock_datetime.min = datetime.min
+            mock_datetime.now.return_value = departure_midnight - timedelta(hours=12)
+            assert _cache_fresh_seconds((today + timedelta(days=1)).isoformat()) == 12 * 3600 / 48
+
+    def test_stale_cache_hit_schedules_one_refresh(self, mock_amadeus_client, mock_cache_manager, validated_state):
+        """Test a stale hit returns cached results and refreshes them in the background"""
+        cached_results = {"data": [{"cached": True}]}
+
+        def stale_lookup(cache_key, max_age_minutes, stale_after_minutes, on_stale):
+            on_stale()
+            return cached_results
+
+        mock_cache_manager.get_cached_results.side_effect = stale_lookup
+        tool = AmadeusSearchTool(mock_amadeus_client, mock_cache_manager)
+
+        with patch("app.langgraph.tools.amadeus_search._REFRESH_EXECUTOR") as executor:
+            first = tool.search(validated_state)
+            second = tool.search(validated_state)
+
+        assert first.cached and second.cached
+        assert first.results == cached_results
+        executor.submit.assert_called_once()
+
+        # Running the refresh re-fetches and re-caches, then allows another refresh
+        refresh, params, cache_key = executor.submit.call_args.args
+        refresh(params, cache_key)
+        mock_amadeus_client.search_flights.assert_called_once()
+        mock_cache_manager.cache_results.assert_called_once()
+        assert tool._refreshing == set()
+
     def test_search_blocks_unvalidated_state(self, mock_amadeus_client, mock_cache_manager):
         """Test that search blocks unvalidated state"""
         state = create_initial_state()
@@ -173,6 +252,17 @@ class TestAmadeusSearchTool:
         # Test unknown locations pass through
         assert tool._resolve_airport_code("Unknown City") == "UNKNOWN CITY"
 
+    def test_airport_code_resolution_cached(self, mock_amadeus_client, mock_cache_manager):
+        """Test repeated locations are resolved from the per-tool cache"""
+        tool = AmadeusSearchTool(mock_amadeus_client, mock_cache_manager)
+
+        assert tool._resolve_airport_code("Paris") == "CDG"
+        assert tool._resolve_airport_code(" paris ") == "CDG"
+
+        info = tool._lookup_airport_code.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
     def test_cache_key_generation(self, mock_amadeus_client, mock_cache_manager):
         """Test cache key generation"""
         tool = AmadeusSearchTool(mock_amadeus_client, mock_cache_manager)